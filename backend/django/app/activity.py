@@ -0,0 +1,92 @@
+import atexit
+from threading import Lock
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from app import models
+from app.buffers import PeriodicFlusher
+
+
+class ActivityBuffer:
+    """
+    An in-memory buffer of activity log entries written in batches.
+
+    Logging only appends to a list. A background thread inserts the entries
+    with one bulk_create every ACTIVITY_BUFFER_SECONDS, and as soon as the
+    buffer holds ACTIVITY_BUFFER_SIZE entries, so an entry waits about
+    ACTIVITY_BUFFER_SECONDS at most. The buffer is also flushed when the
+    process exits. With ACTIVITY_BUFFER_SIZE set to 1 every entry is written
+    right away by the logging request.
+
+        Methods:
+            add(): Adds an entry to the buffer.
+            flush(): Writes all buffered entries to the database.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._lock = Lock()
+        self.flusher = PeriodicFlusher(
+            self.flush, "ACTIVITY_BUFFER_SECONDS", "activity-buffer"
+        )
+
+    def add(self, entry: models.Activity) -> None:
+        """
+        Adds an entry to the buffer, waking up the flush thread if the buffer is full.
+
+            Parameters:
+                entry (Activity): Unsaved activity object.
+        """
+
+        if settings.ACTIVITY_BUFFER_SIZE == 1:
+            entry.save()
+            return
+        with self._lock:
+            self._entries.append(entry)
+            full = len(self._entries) >= settings.ACTIVITY_BUFFER_SIZE
+        if full:
+            self.flusher.wake()
+        else:
+            self.flusher.start()
+
+    def flush(self) -> None:
+        """
+        Writes all buffered entries to the database.
+        """
+
+        with self._lock:
+            entries, self._entries = self._entries, []
+        if entries:
+            models.Activity.objects.bulk_create(
+                entries, batch_size=settings.ACTIVITY_BUFFER_SIZE
+            )
+
+
+buffer = ActivityBuffer()
+
+atexit.register(buffer.flush)
+
+
+def log(action: str, user_id: int | None, project_id: int, changes=None) -> None:
+    """
+    Logs an action on a project once the current transaction commits.
+
+    Actions of rolled back transactions are never logged. Entries reach the
+    database with the next flush of the buffer. A failure to buffer the entry
+    is logged and does not fail the request, whose changes are committed.
+
+        Parameters:
+            action (str): One of the Activity actions.
+            user_id (int or None): Id of the user who acted.
+            project_id (int): Id of the project.
+            changes (dict or None): Details of the action.
+    """
+
+    entry = models.Activity(
+        user_id=user_id,
+        project_id=project_id,
+        action=action,
+        changes=changes,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: buffer.add(entry), robust=True)
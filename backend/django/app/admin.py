@@ -1,6 +1,148 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from app import models
 
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that uses the PostgreSQL row estimate as the count of unfiltered large tables.
+
+    Counting millions of rows exactly scans the whole table on every page of
+    the admin changelist. Unfiltered querysets of tables estimated to hold more
+    than ESTIMATED_COUNT_THRESHOLD rows use pg_class.reltuples instead, which
+    is kept up to date by autovacuum. The parent of a partitioned table has no
+    estimate of its own, so the estimates of its partitions, found through
+    pg_inherits, are added up. Filtered querysets are counted exactly.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Returns the estimated or exact number of objects.
+
+            Returns:
+                (int): Number of objects.
+        """
+
+        queryset = self.object_list
+        connection = connections[getattr(queryset, "db", "default")]
+        if (
+            connection.vendor == "postgresql"
+            and hasattr(queryset, "query")
+            and not queryset.query.where
+        ):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    WITH RECURSIVE tree(oid) AS (
+                        SELECT %s::regclass::oid
+                        UNION ALL
+                        SELECT pg_inherits.inhrelid
+                        FROM pg_inherits JOIN tree ON pg_inherits.inhparent = tree.oid
+                    )
+                    SELECT SUM(GREATEST(pg_class.reltuples, 0))
+                    FROM tree JOIN pg_class ON pg_class.oid = tree.oid
+                    WHERE pg_class.relkind <> 'p'
+                    """,
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] and row[0] > settings.ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base admin for tables with millions of rows.
+
+    Uses estimated counts on unfiltered changelists, skips the second count of
+    filtered ones and picks related users and projects by id instead of
+    loading them all into dropdowns. Rows are ordered by id, so pages and
+    the indexed list filters are read from the (filter, id) indexes.
+    """
+
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class ProjectAdmin(LargeTableAdmin):
+    """
+    Admin for the project model, shows soft-deleted projects too.
+    """
+
+    list_display = ("id", "title", "category", "status", "is_active", "created_at")
+    list_select_related = ("category", "status")
+    list_filter = ("is_active",)
+    raw_id_fields = ("authors", "tags", "images", "files")
+
+    def get_queryset(self, request):
+        return models.Project.all_objects.all()
+
+
+class RatingValueFilter(admin.SimpleListFilter):
+    """
+    Filter of ratings by value with fixed choices, instead of reading the distinct values from the table.
+    """
+
+    title = "value"
+    parameter_name = "value"
+
+    def lookups(self, request, model_admin):
+        return [(value, str(value)) for value in range(1, 6)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(value=self.value())
+        return queryset
+
+
+class RatingAdmin(LargeTableAdmin):
+    """
+    Admin for the rating model.
+    """
+
+    list_display = ("id", "user", "project", "value", "created_at")
+    list_select_related = ("user", "project")
+    list_filter = (RatingValueFilter,)
+    raw_id_fields = ("user", "project")
+
+
+class LikeAdmin(LargeTableAdmin):
+    """
+    Admin for the like model.
+    """
+
+    list_display = ("id", "user", "project", "is_like")
+    list_select_related = ("user", "project")
+    list_filter = ("is_like",)
+    raw_id_fields = ("user", "project")
+
+
+class CommentAdmin(LargeTableAdmin):
+    """
+    Admin for the comment model.
+    """
+
+    list_display = ("id", "user", "project", "created_at")
+    list_select_related = ("user", "project")
+    raw_id_fields = ("user", "project", "images", "files")
+    readonly_fields = ("parent", "path", "depth")
+
+    def delete_queryset(self, request, queryset) -> None:
+        """
+        Deletes the selected comments one by one, each with all of its replies.
+        """
+
+        for comment in queryset:
+            comment.delete()
+
+
 admin.site.register(models.ExtendedGroup)
 admin.site.register(models.Action)
 admin.site.register(models.Profile)
@@ -8,12 +150,19 @@ admin.site.register(models.Department)
 admin.site.register(models.Position)
 admin.site.register(models.Country)
 admin.site.register(models.City)
-admin.site.register(models.Project)
+admin.site.register(models.Project, ProjectAdmin)
 admin.site.register(models.Status)
 admin.site.register(models.Category)
 admin.site.register(models.Tag)
-admin.site.register(models.Rating)
-admin.site.register(models.Like)
-admin.site.register(models.Comment)
+admin.site.register(models.Rating, RatingAdmin)
+admin.site.register(models.Like, LikeAdmin)
+admin.site.register(models.Comment, CommentAdmin)
 admin.site.register(models.Image)
 admin.site.register(models.File)
+admin.site.register(models.ArchivedProject)
+admin.site.register(models.ArchivedComment)
+admin.site.register(models.ArchivedRating)
+admin.site.register(models.ArchivedLike)
+admin.site.register(models.Activity, LargeTableAdmin)
+admin.site.register(models.DailyRollup)
+admin.site.register(models.RollupDay)
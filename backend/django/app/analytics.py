@@ -0,0 +1,183 @@
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from app import models, lookups
+
+Rollup = models.DailyRollup
+
+ARCHIVED_USER_DEPARTMENT = Subquery(
+    models.Profile.objects.filter(user_id=OuterRef("user_id")).values("department_id")[
+        :1
+    ]
+)
+
+SOURCES = {
+    Rollup.PROJECTS_BY_CATEGORY: (
+        (models.Project.all_objects.all(), F("category_id")),
+        (models.ArchivedProject.objects.all(), F("category_id")),
+    ),
+    Rollup.RATINGS_BY_VALUE: (
+        (models.Rating.objects.all(), F("value")),
+        (models.ArchivedRating.objects.all(), F("value")),
+    ),
+    Rollup.RATINGS_BY_DEPARTMENT: (
+        (models.Rating.objects.all(), F("user__profile__department_id")),
+        (models.ArchivedRating.objects.all(), ARCHIVED_USER_DEPARTMENT),
+    ),
+    Rollup.LIKES_BY_DEPARTMENT: (
+        (
+            models.Like.objects.filter(is_like=True),
+            F("user__profile__department_id"),
+        ),
+        (
+            models.ArchivedLike.objects.filter(is_like=True),
+            ARCHIVED_USER_DEPARTMENT,
+        ),
+    ),
+    Rollup.COMMENTS_BY_DEPARTMENT: (
+        (models.Comment.objects.all(), F("user__profile__department_id")),
+        (models.ArchivedComment.objects.all(), ARCHIVED_USER_DEPARTMENT),
+    ),
+}
+
+KEY_NAMES = {
+    Rollup.PROJECTS_BY_CATEGORY: lookups.categories.name,
+    Rollup.RATINGS_BY_VALUE: str,
+    Rollup.RATINGS_BY_DEPARTMENT: lookups.departments.name,
+    Rollup.LIKES_BY_DEPARTMENT: lookups.departments.name,
+    Rollup.COMMENTS_BY_DEPARTMENT: lookups.departments.name,
+}
+
+
+def day_start(day: date) -> datetime:
+    """
+    Returns midnight of the day in the current time zone.
+
+        Parameters:
+            day (date): The day.
+
+        Returns:
+            (datetime): Aware date and time.
+    """
+
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def first_day() -> date | None:
+    """
+    Returns the day of the oldest event of all sources, archived ones included.
+
+        Returns:
+            (date or None): The day, or None if there are no events.
+    """
+
+    days = [
+        queryset.aggregate(first=Min("created_at"))["first"]
+        for sources in SOURCES.values()
+        for queryset, _ in sources
+    ]
+    days = [timezone.localdate(day) for day in days if day]
+    return min(days) if days else None
+
+
+def last_day() -> date | None:
+    """
+    Returns the last day that was rolled up, whether it had events or not.
+
+        Returns:
+            (date or None): The day, or None if nothing was rolled up yet.
+    """
+
+    return models.RollupDay.objects.aggregate(last=Max("day"))["last"]
+
+
+def build(start: date, end: date) -> int:
+    """
+    Rolls up the days from start up to, not including, end.
+
+    Every metric is counted with one grouped query over the range per source.
+    Rows moved to the archive tables by archive_projects are counted like the
+    live ones, so rebuilt days keep their counts after projects are archived.
+    Existing rollups of the range are replaced, so the days can be rebuilt at
+    any time, and the days are recorded as rolled up.
+
+        Parameters:
+            start (date): First day.
+            end (date): Day after the last day.
+
+        Returns:
+            (int): Number of rollup rows written.
+    """
+
+    counts = Counter()
+    for metric, sources in SOURCES.items():
+        for queryset, key in sources:
+            rows = (
+                queryset.filter(
+                    created_at__gte=day_start(start), created_at__lt=day_start(end)
+                )
+                .annotate(day=TruncDate("created_at"), key=key)
+                .values("day", "key")
+                .annotate(count=Count("pk"))
+                .order_by()
+            )
+            for row in rows:
+                counts[metric, row["day"], row["key"] or 0] += row["count"]
+    rows = [
+        Rollup(day=day, metric=metric, key=key, count=count)
+        for (metric, day, key), count in counts.items()
+    ]
+    days = [
+        models.RollupDay(day=start + timedelta(days=offset))
+        for offset in range((end - start).days)
+    ]
+    with transaction.atomic():
+        Rollup.objects.filter(day__gte=start, day__lt=end).delete()
+        Rollup.objects.bulk_create(rows, batch_size=1000)
+        models.RollupDay.objects.bulk_create(
+            days,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["day"],
+            update_fields=["built_at"],
+        )
+    return len(rows)
+
+
+def read(start: date, end: date) -> dict:
+    """
+    Returns the daily counts and the totals of every metric between two days.
+
+    Totals of the range are summed by the database over the rollup rows,
+    the source tables are not read.
+
+        Parameters:
+            start (date): First day.
+            end (date): Last day, included.
+
+        Returns:
+            (dict): Days and totals of every metric, with the names of the keys.
+    """
+
+    rollups = Rollup.objects.filter(day__gte=start, day__lte=end)
+    data = {metric: {"days": [], "totals": []} for metric in SOURCES}
+    for metric, day, key, count in rollups.order_by("metric", "day", "key").values_list(
+        "metric", "day", "key", "count"
+    ):
+        name = KEY_NAMES[metric](key) if key else None
+        data[metric]["days"].append(
+            {"day": day, "key": key, "name": name, "count": count}
+        )
+    totals = (
+        rollups.values("metric", "key")
+        .annotate(count=Sum("count"))
+        .order_by("metric", "-count")
+    )
+    for row in totals:
+        metric, key = row["metric"], row["key"]
+        name = KEY_NAMES[metric](key) if key else None
+        data[metric]["totals"].append({"key": key, "name": name, "count": row["count"]})
+    return data
@@ -0,0 +1,76 @@
+import logging
+from threading import Event, Lock, Thread
+from typing import Callable
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlusher:
+    """
+    Flushes an in-memory buffer from a daemon thread.
+
+    The thread is started on first use in every process, so workers forked from
+    a preloaded master get their own. It flushes the buffer every interval
+    seconds, or right away when woken up, so requests never pay for a flush and
+    a buffered entry waits at most about one interval, even on an idle worker.
+
+        Attributes:
+            flush (Callable): Function writing the buffer to the database.
+            interval_setting (str): Name of the setting with the interval in seconds.
+            name (str): Name of the thread.
+
+        Methods:
+            start(): Starts the thread if it is not running in this process.
+            wake(): Asks the thread to flush now.
+            run(): Flush loop of the thread.
+    """
+
+    def __init__(self, flush: Callable[[], None], interval_setting: str, name: str):
+        self.flush = flush
+        self.interval_setting = interval_setting
+        self.name = name
+        self._wakeup = Event()
+        self._thread = None
+        self._lock = Lock()
+
+    def start(self) -> None:
+        """
+        Starts the thread if it is not running in this process.
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self.run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def wake(self) -> None:
+        """
+        Asks the thread to flush now.
+        """
+
+        self.start()
+        self._wakeup.set()
+
+    def run(self) -> None:
+        """
+        Flush loop of the thread, errors are logged and the entries of the failed flush are dropped.
+
+        Connections are closed around every flush like around a request, so
+        an idle thread does not hold one beyond CONN_MAX_AGE.
+        """
+
+        while True:
+            self._wakeup.wait(getattr(settings, self.interval_setting))
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing %s failed.", self.name)
+                connections.close_all()
+            else:
+                close_old_connections()
@@ -0,0 +1,117 @@
+from datetime import datetime
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    Count,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from app import models, versions
+from app.pagination import before_keyset
+
+VERSION_KEY = "cards:version"
+
+
+def per_project(queryset: QuerySet, aggregate, output_field) -> Subquery:
+    """
+    Returns a correlated subquery aggregating the rows of the outer project.
+
+        Parameters:
+            queryset (QuerySet): Rows with a project foreign key.
+            aggregate (Aggregate): Aggregate of the rows, e.g. Count("id").
+            output_field (Field): Type of the result.
+
+        Returns:
+            (Subquery): One value per project.
+    """
+
+    return Subquery(
+        queryset.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(value=aggregate)
+        .values("value"),
+        output_field=output_field,
+    )
+
+
+def read(before: tuple[datetime, int] | None, limit: int) -> list[dict]:
+    """
+    Returns a page of project cards, newest first, with a single query.
+
+    The cover image and the counters are correlated subqueries evaluated for
+    the rows of the page only, authors, tags, files and descriptions are not
+    read at all.
+
+        Parameters:
+            before (tuple[datetime, int] or None): Creation date and id of the last card of the previous page.
+            limit (int): Page size.
+
+        Returns:
+            (list[dict]): Id, title, category id, creation date, cover image, likes, comments and average rating of every project.
+    """
+
+    projects = models.Project.objects.all()
+    if before:
+        projects = projects.filter(before_keyset(before))
+    cover = (
+        models.Image.objects.filter(project_images=OuterRef("pk"))
+        .order_by("id")
+        .values("url")[:1]
+    )
+    return list(
+        projects.order_by("-created_at", "-id")
+        .values("id", "title", "category_id", "created_at")
+        .annotate(
+            image=Subquery(cover),
+            likes=Coalesce(
+                per_project(
+                    models.Like.objects.filter(is_like=True),
+                    Count("id"),
+                    IntegerField(),
+                ),
+                0,
+            ),
+            comments=Coalesce(
+                per_project(models.Comment.objects.all(), Count("id"), IntegerField()),
+                0,
+            ),
+            rating=per_project(models.Rating.objects.all(), Avg("value"), FloatField()),
+        )[:limit]
+    )
+
+
+def version() -> int:
+    """
+    Returns the version of the project cards shared by all workers.
+
+        Returns:
+            (int): Version counter from the cache.
+    """
+
+    return versions.get(VERSION_KEY)
+
+
+def changed(*args, **kwargs) -> None:
+    """
+    Signal receiver, bumps the version of the project cards once the transaction commits.
+
+    Only changes to the projects themselves bump the version, counters of
+    cached cards are refreshed when their cache entries expire. There is no
+    receiver for the links to images: projects get their images in the
+    transaction that saves them, and a receiver of m2m_changed would make
+    every add() read the existing links before inserting.
+    """
+
+    transaction.on_commit(
+        lambda: versions.bump(VERSION_KEY), using=kwargs.get("using"), robust=True
+    )
+
+
+post_save.connect(changed, sender=models.Project, weak=False)
+post_delete.connect(changed, sender=models.Project, weak=False)
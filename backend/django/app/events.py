@@ -0,0 +1,207 @@
+import json
+import asyncio
+import logging
+from threading import Lock, Thread
+from time import sleep
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "project_events"
+
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class Subscriber:
+    """
+    A client listening to the events of a project.
+
+    Events are put into a bounded queue from any thread. When the client reads
+    too slowly and the queue is full, the queued events are dropped and replaced
+    by a single "resync" event, telling the client to reload the project instead
+    of holding an unbounded backlog in memory.
+
+        Attributes:
+            queue (asyncio.Queue): Pending events.
+
+        Methods:
+            put(): Queues an event from any thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"event": "resync", "data": {}}
+        self.queue.put_nowait(event)
+
+    def put(self, event: dict) -> None:
+        """
+        Queues an event from any thread, events for closed loops are ignored.
+
+            Parameters:
+                event (dict): Event name and data.
+        """
+
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass
+
+
+class Broker:
+    """
+    An in-process publish/subscribe broker of project events.
+
+        Methods:
+            subscribe(): Registers a subscriber for the project.
+            unsubscribe(): Removes a subscriber of the project.
+            dispatch(): Delivers an event to the local subscribers of the project.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = Lock()
+
+    def subscribe(self, project_id: int) -> Subscriber:
+        """
+        Registers a subscriber for the project, must be called from the event loop of the client.
+
+            Parameters:
+                project_id (int): Project id.
+
+            Returns:
+                (Subscriber): New subscriber.
+        """
+
+        subscriber = Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, project_id: int, subscriber: Subscriber) -> None:
+        """
+        Removes a subscriber of the project.
+
+            Parameters:
+                project_id (int): Project id.
+                subscriber (Subscriber): Subscriber to remove.
+        """
+
+        with self._lock:
+            subscribers = self._subscribers.get(project_id, set())
+            subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(project_id, None)
+
+    def dispatch(self, project_id: int, event: dict) -> None:
+        """
+        Delivers an event to the local subscribers of the project.
+
+            Parameters:
+                project_id (int): Project id.
+                event (dict): Event name and data.
+        """
+
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+
+broker = Broker()
+
+
+def listen() -> None:
+    """
+    Forwards PostgreSQL notifications of the events channel to the local broker.
+
+    Runs in a daemon thread with its own connection, so events published by any
+    worker reach the subscribers of every worker.
+    """
+
+    import select
+    import psycopg2
+
+    database = settings.DATABASES["default"]
+    while True:
+        listener = None
+        try:
+            listener = psycopg2.connect(
+                dbname=database["NAME"],
+                user=database["USER"],
+                password=database["PASSWORD"],
+                host=database["HOST"],
+                port=database["PORT"],
+            )
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while True:
+                if select.select([listener], [], [], 60) == ([], [], []):
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    message = json.loads(listener.notifies.pop(0).payload)
+                    broker.dispatch(message["project"], message["event"])
+        except Exception:
+            logger.exception("Project events listener failed, reconnecting.")
+            if listener is not None:
+                listener.close()
+            sleep(1)
+
+
+_listener = None
+_listener_lock = Lock()
+
+
+def start_listener() -> None:
+    """
+    Starts the PostgreSQL listener thread once per process when EVENTS_BACKEND is "postgres".
+    """
+
+    global _listener
+    if settings.EVENTS_BACKEND != "postgres":
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = Thread(target=listen, name="project-events", daemon=True)
+            _listener.start()
+
+
+def publish(project_id: int, name: str, data: dict) -> None:
+    """
+    Publishes an event of the project once the current transaction commits.
+
+    With EVENTS_BACKEND "postgres" the event goes through NOTIFY to every
+    worker, otherwise it is delivered to the subscribers of this process only.
+    NOTIFY payloads are limited in size, events too large for it are sent
+    without data apart from the id, clients fetch the object themselves.
+    Failures to send are logged, the change that caused the event is already
+    committed and the request still succeeds.
+
+        Parameters:
+            project_id (int): Project id.
+            name (str): Event name, e.g. "comment", "rating" or "project".
+            data (dict): Event data, must be JSON serializable.
+    """
+
+    event = {"event": name, "data": data}
+
+    def send():
+        if settings.EVENTS_BACKEND == "postgres":
+            payload = json.dumps({"project": project_id, "event": event}, default=str)
+            if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+                short = {"event": name, "data": {"id": data.get("id")}}
+                payload = json.dumps({"project": project_id, "event": short})
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+        else:
+            broker.dispatch(project_id, event)
+
+    transaction.on_commit(send, robust=True)
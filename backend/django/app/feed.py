@@ -0,0 +1,125 @@
+from datetime import datetime
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from app import models
+from app.pagination import before_keyset
+
+
+def audience(project: models.Project, limit: int) -> dict[int, str] | None:
+    """
+    Returns the users who should see the project in their feeds.
+
+    Tag and group audiences are read with at most limit + 1 rows each, so a
+    popular tag or a big group is detected without loading all of its members.
+
+        Parameters:
+            project (Project): The project object.
+            limit (int): Maximum audience size to fan out on write.
+
+        Returns:
+            (dict[int, str] or None): Feed reasons indexed by user id, or None if the audience exceeds the limit.
+    """
+
+    author_ids = list(project.authors.values_list("id", flat=True))
+    tag_ids = list(project.tags.values_list("id", flat=True))
+    readers = {}
+    if tag_ids:
+        tag_readers = (
+            User.objects.filter(authors__tags__in=tag_ids)
+            .values_list("id", flat=True)
+            .distinct()[: limit + 1]
+        )
+        readers.update((id, models.FeedItem.TAG) for id in tag_readers)
+    if author_ids:
+        group_readers = (
+            User.objects.filter(users__users__in=author_ids)
+            .values_list("id", flat=True)
+            .distinct()[: limit + 1]
+        )
+        readers.update((id, models.FeedItem.GROUP) for id in group_readers)
+    if len(readers) > limit:
+        return None
+    readers.update((id, models.FeedItem.AUTHORED) for id in author_ids)
+    return readers
+
+
+def publish(project: models.Project) -> None:
+    """
+    Publishes the project to the feeds of its audience.
+
+    Small audiences get a feed item each (fan-out on write). Large audiences get
+    a single broadcast row that readers match on read, authors always get a
+    feed item. Publishing again after the tags or authors of the project
+    changed brings the feeds up to date: users who left the audience lose
+    their feed item, and a project whose audience shrank below the limit is
+    no longer broadcast.
+
+        Parameters:
+            project (Project): The project object.
+    """
+
+    readers = audience(project, settings.FEED_FANOUT_LIMIT)
+    if readers is None:
+        models.FeedBroadcast.objects.get_or_create(
+            project=project, defaults={"created_at": project.created_at}
+        )
+        readers = {
+            id: models.FeedItem.AUTHORED
+            for id in project.authors.values_list("id", flat=True)
+        }
+    else:
+        models.FeedBroadcast.objects.filter(project=project).delete()
+    models.FeedItem.objects.filter(project=project).exclude(
+        user_id__in=list(readers)
+    ).delete()
+    models.FeedItem.objects.bulk_create(
+        [
+            models.FeedItem(
+                user_id=user_id,
+                project=project,
+                reason=reason,
+                created_at=project.created_at,
+            )
+            for user_id, reason in readers.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "project"],
+        update_fields=["reason"],
+    )
+
+
+def read(user: User, before: tuple[datetime, int] | None, limit: int) -> list[tuple]:
+    """
+    Returns a page of the feed of the user, newest first.
+
+    Merges one range scan over the feed items of the user with the broadcasts
+    relevant to the user, both limited to the page size.
+
+        Parameters:
+            user (User): The user object.
+            before (tuple[datetime, int] or None): Creation date and id of the last project of the previous page.
+            limit (int): Page size.
+
+        Returns:
+            (list[tuple[datetime, int]]): Creation date and id of every project on the page.
+    """
+
+    items = models.FeedItem.objects.filter(user=user)
+    broadcasts = models.FeedBroadcast.objects.filter(
+        Q(project__tags__tags__authors=user) | Q(project__authors__users__users=user)
+    )
+    if before:
+        items = items.filter(before_keyset(before, id_field="project_id"))
+        broadcasts = broadcasts.filter(before_keyset(before, id_field="project_id"))
+    rows = set(
+        items.order_by("-created_at", "-project_id").values_list(
+            "created_at", "project_id"
+        )[:limit]
+    )
+    rows.update(
+        broadcasts.order_by("-created_at", "-project_id")
+        .values_list("created_at", "project_id")
+        .distinct()[:limit]
+    )
+    return sorted(rows, reverse=True)[:limit]
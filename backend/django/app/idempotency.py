@@ -0,0 +1,126 @@
+import json
+from datetime import timedelta
+from functools import wraps
+from hashlib import sha256
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from app import models
+
+HEADER = "Idempotency-Key"
+
+
+def get_fingerprint(request: Request) -> str:
+    """
+    Returns a hash of the method, path and body of the request.
+
+        Parameters:
+            request (Request): The request object.
+
+        Returns:
+            (str): Hexadecimal SHA-256 digest.
+    """
+
+    body = sorted(request.POST.lists())
+    payload = json.dumps([request.method, request.path, body])
+    return sha256(payload.encode()).hexdigest()
+
+
+def get_stored(user, key: str) -> models.IdempotencyKey | None:
+    """
+    Returns the stored response of the key, expired keys are deleted.
+
+        Parameters:
+            user (User): The user object.
+            key (str): Value of the Idempotency-Key header.
+
+        Returns:
+            (IdempotencyKey or None): Stored response.
+    """
+
+    stored = models.IdempotencyKey.objects.filter(user=user, key=key).first()
+    expires = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_SECONDS)
+    if stored and stored.created_at < expires:
+        stored.delete()
+        return None
+    return stored
+
+
+def replay(stored: models.IdempotencyKey, fingerprint: str) -> Response:
+    """
+    Returns the stored response, or an error if the key was used for another request.
+
+        Parameters:
+            stored (IdempotencyKey): Stored response.
+            fingerprint (str): Fingerprint of the current request.
+
+        Returns:
+            (Response): The response object.
+    """
+
+    if stored.fingerprint != fingerprint:
+        return Response(
+            data={"error": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        data=stored.response,
+        status=stored.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def idempotent(method):
+    """
+    Decorator for POST handlers that makes retries with an Idempotency-Key header safe.
+
+    The first successful response of a key is stored in the transaction of the
+    write, retries with the same key get it back without repeating the write.
+    Failed responses are not stored, so the request can be retried. When two
+    requests with the same key run at once, the unique constraint rolls back
+    the second one, which then returns the response of the first. Keys expire
+    after IDEMPOTENCY_KEY_SECONDS.
+
+        Parameters:
+            method (Callable): View handler taking the request as the first argument after self.
+
+        Returns:
+            (Callable): Wrapped view handler.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response(
+                data={"error": f"{HEADER} must be at most 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        fingerprint = get_fingerprint(request)
+        stored = get_stored(request.user, key)
+        if stored:
+            return replay(stored, fingerprint)
+        try:
+            with transaction.atomic():
+                response = method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    models.IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        fingerprint=fingerprint,
+                        status_code=response.status_code,
+                        response=response.data,
+                    )
+        except IntegrityError:
+            stored = get_stored(request.user, key)
+            if stored is None:
+                raise
+            return replay(stored, fingerprint)
+        return response
+
+    return wrapper
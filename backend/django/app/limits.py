@@ -0,0 +1,72 @@
+from django.conf import settings
+from rest_framework import status
+
+
+def max_body_size(setting: str):
+    """
+    Decorator for handlers that rejects request bodies larger than the setting.
+
+    Only marks the handler, the limit is enforced by BodySizeMiddleware before
+    the view is called. DRF views authenticate before the handler runs, and the
+    CSRF check of session authentication reads request.POST, so a check in the
+    handler would come after the body was read and parsed.
+
+        Parameters:
+            setting (str): Name of the setting with the maximum size in bytes.
+
+        Returns:
+            (Callable): Decorator of view handlers.
+    """
+
+    def decorator(method):
+        method.max_body_size = setting
+        return method
+
+    return decorator
+
+
+def get_limit(view_func, method: str) -> int | None:
+    """
+    Returns the body size limit of the handler called for the request.
+
+        Parameters:
+            view_func (Callable): View function, as returned by as_view for class-based views.
+            method (str): HTTP method of the request.
+
+        Returns:
+            (int or None): Maximum size in bytes, None if the handler has no limit.
+    """
+
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    handler = getattr(view_class, method.lower(), None) if view_class else view_func
+    setting = getattr(handler, "max_body_size", None)
+    return getattr(settings, setting) if setting else None
+
+
+def check_body_size(request, limit: int) -> tuple[str, int] | None:
+    """
+    Checks the declared Content-Length of the request against the limit.
+
+    Requests without a valid Content-Length, e.g. with a chunked body, are
+    rejected, as their size is only known once the body is read.
+
+        Parameters:
+            request (HttpRequest): The request object.
+            limit (int): Maximum size in bytes.
+
+        Returns:
+            (tuple[str, int] or None): Error message and status code, None if the body is within the limit.
+    """
+
+    try:
+        length = int(request.META["CONTENT_LENGTH"])
+    except (KeyError, ValueError):
+        return "Content-Length is required.", status.HTTP_411_LENGTH_REQUIRED
+    if length > limit:
+        return (
+            f"Request body must be at most {limit} bytes.",
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    return None
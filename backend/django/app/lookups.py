@@ -0,0 +1,224 @@
+from threading import Lock
+from time import monotonic
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.text import slugify
+from app import models, versions
+
+
+class LookupTable:
+    """
+    A process-wide in-memory copy of a small slug-keyed table.
+
+    The table is loaded with a single query on first access and kept until it is
+    invalidated, so serializers and views can resolve names and slugs per row
+    without touching the database.
+
+    Writes in one worker reach the others through a version counter in the
+    shared cache: every worker compares its loaded version with the shared one
+    at most once per LOOKUP_TABLES_CHECK_INTERVAL seconds and reloads on mismatch.
+
+        Attributes:
+            model (Model): Model class of the table.
+            version_key (str): Cache key of the shared version counter.
+            by_id (dict[int, Model]): Rows indexed by id.
+            by_slug (dict[str, Model]): Rows indexed by slug.
+
+        Methods:
+            load(): Loads the table from the database if it is not loaded or outdated.
+            invalidate(): Drops the loaded rows, the next access reloads them.
+            changed(): Signal receiver, invalidates the table in every worker.
+            get(): Returns the row with the given id.
+            get_by_slug(): Returns the row with the given slug.
+            name(): Returns the name of the row with the given id.
+            ids(): Returns the ids of the rows with the given slugs.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"lookups:{model._meta.label_lower}:version"
+        self._data = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = Lock()
+
+    def shared_version(self) -> int:
+        """
+        Returns the version of the table shared by all workers.
+
+            Returns:
+                (int): Version counter from the cache.
+        """
+
+        return versions.get(self.version_key)
+
+    def is_outdated(self) -> bool:
+        """
+        Checks whether another worker has changed the table since it was loaded.
+
+        The shared cache is consulted at most once per check interval.
+
+            Returns:
+                (bool): True if the loaded rows must be reloaded.
+        """
+
+        now = monotonic()
+        if now - self._checked_at < settings.LOOKUP_TABLES_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return self.shared_version() != self._version
+
+    def load(self) -> tuple[dict, dict]:
+        """
+        Loads the table from the database if it is not loaded or outdated.
+
+        The rows are always read from the primary: the loaded version is the
+        latest one, a lagging replica could return the rows from before it and
+        the worker would keep them until the next change of the table.
+
+            Returns:
+                (tuple[dict, dict]): Rows indexed by id and rows indexed by slug.
+        """
+
+        data = self._data
+        if data is not None and not self.is_outdated():
+            return data
+        with self._lock:
+            data = self._data
+            version = self.shared_version()
+            if data is None or self._version != version:
+                self._version = version
+                self._checked_at = monotonic()
+                rows = list(
+                    self.model.objects.using("default").only("id", "name", "slug")
+                )
+                data = (
+                    {row.id: row for row in rows},
+                    {row.slug: row for row in rows},
+                )
+                self._data = data
+            return data
+
+    def invalidate(self) -> None:
+        """
+        Drops the loaded rows, the next access reloads them.
+        """
+
+        self._data = None
+
+    def changed(self, *args, **kwargs) -> None:
+        """
+        Signal receiver, invalidates the table in every worker.
+
+        The local copy is dropped right away, the shared version is bumped once
+        the transaction commits so other workers do not reload uncommitted rows.
+        """
+
+        self.invalidate()
+
+        def bump():
+            self.invalidate()
+            versions.bump(self.version_key)
+
+        transaction.on_commit(bump, using=kwargs.get("using"), robust=True)
+
+    @property
+    def by_id(self) -> dict:
+        return self.load()[0]
+
+    @property
+    def by_slug(self) -> dict:
+        return self.load()[1]
+
+    def get(self, id: int | None):
+        """
+        Returns the row with the given id.
+
+            Parameters:
+                id (int or None): Row id.
+
+            Returns:
+                (Model or None): Row or None if there is no such row.
+        """
+
+        return self.by_id.get(id) if id is not None else None
+
+    def get_by_slug(self, slug: str | None):
+        """
+        Returns the row with the given slug.
+
+            Parameters:
+                slug (str or None): Row slug.
+
+            Returns:
+                (Model or None): Row or None if there is no such row.
+        """
+
+        return self.by_slug.get(slug) if slug else None
+
+    def name(self, id: int | None) -> str | None:
+        """
+        Returns the name of the row with the given id.
+
+            Parameters:
+                id (int or None): Row id.
+
+            Returns:
+                (str or None): Row name or None if there is no such row.
+        """
+
+        row = self.get(id)
+        return row.name if row else None
+
+    def ids(self, slugs) -> list[int]:
+        """
+        Returns the ids of the rows with the given slugs, unknown slugs are skipped.
+
+            Parameters:
+                slugs (Iterable[str]): Row slugs.
+
+            Returns:
+                (list[int]): Row ids.
+        """
+
+        by_slug = self.by_slug
+        return [by_slug[slug].id for slug in slugs if slug in by_slug]
+
+
+countries = LookupTable(models.Country)
+cities = LookupTable(models.City)
+departments = LookupTable(models.Department)
+positions = LookupTable(models.Position)
+categories = LookupTable(models.Category)
+tags = LookupTable(models.Tag)
+statuses = LookupTable(models.Status)
+
+TABLES = (countries, cities, departments, positions, categories, tags, statuses)
+
+for table in TABLES:
+    post_save.connect(table.changed, sender=table.model, weak=False)
+    post_delete.connect(table.changed, sender=table.model, weak=False)
+
+
+def tag_ids(names) -> list[int]:
+    """
+    Returns the ids of the tags with the given names or slugs, creating missing tags.
+
+    Known tags are resolved from the cached table without queries, missing ones
+    are created in bulk with models.TagManager.get_or_create_many.
+
+        Parameters:
+            names (Iterable[str]): Tag names or slugs.
+
+        Returns:
+            (list[int]): Tag ids in the order of the given names, without duplicates.
+    """
+
+    slugs = list(dict.fromkeys(slug for slug in map(slugify, names) if slug))
+    known = tags.by_slug
+    if all(slug in known for slug in slugs):
+        return [known[slug].id for slug in slugs]
+    created = models.Tag.objects.get_or_create_many(names)
+    tags.changed()
+    return [created[slug] for slug in slugs if slug in created]
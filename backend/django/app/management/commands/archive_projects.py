@@ -0,0 +1,161 @@
+from datetime import timedelta
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from app import models
+
+
+class Command(BaseCommand):
+    """
+    Moves long soft-deleted projects with their comments, ratings and likes into the archive tables.
+
+    Projects are processed in batches, every batch is copied and deleted in its own
+    transaction, so the command can be interrupted and restarted at any time.
+
+        Parameters:
+            days (int): Minimum number of days since the project was deactivated.
+            batch_size (int): Number of projects per batch.
+            dry_run (bool): Only count the projects that would be archived.
+    """
+
+    help = "Moves long soft-deleted projects into the archive tables."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        projects = models.Project.all_objects.filter(
+            is_active=False, updated_at__lt=cutoff
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{projects.count()} projects would be archived.")
+            return
+        total = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    projects.order_by("id")
+                    .select_for_update(skip_locked=True)
+                    .values_list("id", flat=True)[: options["batch_size"]]
+                )
+                if not ids:
+                    break
+                self.archive(ids)
+            total += len(ids)
+            self.stdout.write(f"Archived {total} projects.")
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} projects archived."))
+
+    def related_ids(self, through, source: str, target: str, ids: list) -> dict:
+        """
+        Returns the ids of related rows grouped by the source row.
+
+            Parameters:
+                through (Model): Through model of the many-to-many field.
+                source (str): Column of the source row.
+                target (str): Column of the related row.
+                ids (list[int]): Ids of the source rows.
+
+            Returns:
+                (dict[int, list[int]]): Related row ids indexed by source row id.
+        """
+
+        grouped = defaultdict(list)
+        rows = through.objects.filter(**{f"{source}__in": ids}).values_list(
+            source, target
+        )
+        for source_id, target_id in rows:
+            grouped[source_id].append(target_id)
+        return grouped
+
+    def archive(self, ids: list) -> None:
+        """
+        Copies a batch of projects with their related rows into the archive tables and deletes them.
+
+            Parameters:
+                ids (list[int]): Ids of the projects.
+        """
+
+        Project, Comment = models.Project, models.Comment
+        authors = self.related_ids(
+            Project.authors.through, "project_id", "user_id", ids
+        )
+        tags = self.related_ids(Project.tags.through, "project_id", "tag_id", ids)
+        images = self.related_ids(Project.images.through, "project_id", "image_id", ids)
+        files = self.related_ids(Project.files.through, "project_id", "file_id", ids)
+        models.ArchivedProject.objects.bulk_create(
+            [
+                models.ArchivedProject(
+                    id=project.id,
+                    title=project.title,
+                    description=project.description,
+                    category_id=project.category_id,
+                    status_id=project.status_id,
+                    authors=authors[project.id],
+                    tags=tags[project.id],
+                    images=images[project.id],
+                    files=files[project.id],
+                    created_at=project.created_at,
+                    updated_at=project.updated_at,
+                )
+                for project in Project.all_objects.filter(id__in=ids)
+            ],
+            ignore_conflicts=True,
+        )
+
+        comments = list(Comment.objects.filter(project_id__in=ids))
+        comment_ids = [comment.id for comment in comments]
+        comment_images = self.related_ids(
+            Comment.images.through, "comment_id", "image_id", comment_ids
+        )
+        comment_files = self.related_ids(
+            Comment.files.through, "comment_id", "file_id", comment_ids
+        )
+        models.ArchivedComment.objects.bulk_create(
+            [
+                models.ArchivedComment(
+                    id=comment.id,
+                    project_id=comment.project_id,
+                    user_id=comment.user_id,
+                    parent_id=comment.parent_id,
+                    text=comment.text,
+                    images=comment_images[comment.id],
+                    files=comment_files[comment.id],
+                    created_at=comment.created_at,
+                    updated_at=comment.updated_at,
+                )
+                for comment in comments
+            ],
+            ignore_conflicts=True,
+        )
+        models.ArchivedRating.objects.bulk_create(
+            [
+                models.ArchivedRating(
+                    id=rating.id,
+                    project_id=rating.project_id,
+                    user_id=rating.user_id,
+                    value=rating.value,
+                    created_at=rating.created_at,
+                )
+                for rating in models.Rating.objects.filter(project_id__in=ids)
+            ],
+            ignore_conflicts=True,
+        )
+        models.ArchivedLike.objects.bulk_create(
+            [
+                models.ArchivedLike(
+                    id=like.id,
+                    project_id=like.project_id,
+                    user_id=like.user_id,
+                    is_like=like.is_like,
+                    created_at=like.created_at,
+                )
+                for like in models.Like.objects.filter(project_id__in=ids)
+            ],
+            ignore_conflicts=True,
+        )
+        Project.all_objects.filter(id__in=ids).delete()
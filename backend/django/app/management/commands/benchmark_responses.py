@@ -0,0 +1,116 @@
+import gzip
+from time import process_time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from app import models, serializers
+from app.middleware import brotli, zstandard
+from app.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """
+    Measures bytes on the wire and CPU time per response for a ProjectList.get page.
+
+    Renders the page with the standard DRF renderer and with FastJSONRenderer,
+    then compresses it with every available encoding.
+
+        Parameters:
+            projects (int): Number of synthetic projects on the page.
+            from_db (bool): Serialize real projects from the database instead.
+            repeat (int): Number of repetitions per measurement.
+    """
+
+    help = "Measures bytes on the wire and CPU time per project list response."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=1000)
+        parser.add_argument("--from-db", action="store_true")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def get_data(self, options) -> dict:
+        """
+        Returns the response data of a project list page.
+
+            Parameters:
+                options (dict): Command options.
+
+            Returns:
+                (dict): Response data in the ProjectList.get format.
+        """
+
+        if options["from_db"]:
+            projects = models.Project.objects.prefetch_related(
+                "authors", "tags", "images", "files"
+            )[: options["projects"]]
+            serializer = serializers.ProjectSerializer(projects, many=True)
+            return {"data": serializer.data}
+        now = timezone.now().isoformat()
+        description = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8
+        return {
+            "data": [
+                {
+                    "id": id,
+                    "title": f"Project {id}",
+                    "description": description,
+                    "authors": [f"user{id % 50}", f"user{id % 70}"],
+                    "category": f"Category {id % 10}",
+                    "tags": [f"Tag {id % 20}", f"Tag {id % 30}", f"Tag {id % 40}"],
+                    "images": [f"images/project_{id}_{n}.jpg" for n in range(3)],
+                    "files": [f"files/project_{id}.pdf"],
+                    "status": "Active",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for id in range(1, options["projects"] + 1)
+            ]
+        }
+
+    def measure(self, function, repeat: int) -> tuple:
+        """
+        Runs the function repeatedly and returns its result and CPU time per call.
+
+            Parameters:
+                function (Callable): Function without arguments.
+                repeat (int): Number of calls.
+
+            Returns:
+                (tuple[object, float]): Result of the last call and milliseconds of CPU time per call.
+        """
+
+        started = process_time()
+        for _ in range(repeat):
+            result = function()
+        return result, (process_time() - started) * 1000 / repeat
+
+    def handle(self, *args, **options):
+        data = self.get_data(options)
+        repeat = options["repeat"]
+        renderers = {"drf": JSONRenderer()}
+        if orjson is not None:
+            renderers["orjson"] = FastJSONRenderer()
+        encoders = {
+            "identity": lambda content: content,
+            "gzip": lambda content: gzip.compress(content, 6, mtime=0),
+        }
+        if brotli is not None:
+            encoders["br"] = lambda content: brotli.compress(content, quality=5)
+        if zstandard is not None:
+            encoders["zstd"] = zstandard.ZstdCompressor(level=3).compress
+
+        self.stdout.write(f"{len(data['data'])} projects, {repeat} runs each")
+        self.stdout.write(
+            f"{'renderer':<10}{'encoding':<10}{'bytes':>12}"
+            f"{'render ms':>12}{'encode ms':>12}"
+        )
+        for renderer_name, renderer in renderers.items():
+            content, render_ms = self.measure(
+                lambda: renderer.render(data, "application/json", {}), repeat
+            )
+            for encoding, encode in encoders.items():
+                body, encode_ms = self.measure(lambda: encode(content), repeat)
+                self.stdout.write(
+                    f"{renderer_name:<10}{encoding:<10}{len(body):>12}"
+                    f"{render_ms:>12.2f}{encode_ms:>12.2f}"
+                )
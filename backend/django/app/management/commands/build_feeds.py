@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from app import models, feed
+
+
+class Command(BaseCommand):
+    """
+    Publishes existing active projects to the feeds, e.g. after enabling feeds or changing FEED_FANOUT_LIMIT.
+
+        Parameters:
+            batch_size (int): Number of projects loaded at once.
+    """
+
+    help = "Publishes existing active projects to the feeds."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        projects = models.Project.objects.order_by("id")
+        total = 0
+        for project in projects.iterator(chunk_size=options["batch_size"]):
+            feed.publish(project)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} projects published."))
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from app import analytics
+
+
+class Command(BaseCommand):
+    """
+    Rolls up the complete days that are not rolled up yet, meant to run daily after midnight.
+
+    Starts the day after the last rolled up day, or at the oldest event on the
+    first run, and stops before today. Days are processed in batches, every
+    batch in its own transaction.
+
+        Parameters:
+            since (str): ISO date to rebuild from, e.g. after late writes.
+            batch_days (int): Number of days per batch.
+    """
+
+    help = "Rolls up the complete days that are not rolled up yet."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, default=None)
+        parser.add_argument("--batch-days", type=int, default=31)
+
+    def handle(self, *args, **options):
+        end = timezone.localdate()
+        if options["since"]:
+            start = options["since"]
+        elif analytics.last_day():
+            start = analytics.last_day() + timedelta(days=1)
+        else:
+            start = analytics.first_day() or end
+        total = 0
+        while start < end:
+            batch_end = min(start + timedelta(days=options["batch_days"]), end)
+            rows = analytics.build(start, batch_end)
+            total += rows
+            self.stdout.write(f"Rolled up {start} to {batch_end}, {rows} rows.")
+            start = batch_end
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} rows written."))
@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from app import models
+
+
+class Command(BaseCommand):
+    """
+    Deletes the idempotency keys older than IDEMPOTENCY_KEY_SECONDS, meant to run periodically.
+    """
+
+    help = "Deletes expired idempotency keys."
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        expires = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_SECONDS)
+        deleted, _ = models.IdempotencyKey.objects.filter(
+            created_at__lt=expires
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"Done, {deleted} keys deleted."))
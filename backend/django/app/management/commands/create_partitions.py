@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from app import partitions
+
+
+class Command(BaseCommand):
+    """
+    Creates the monthly partitions of the partitioned tables ahead of time, meant to run daily.
+
+    Rows outside of every monthly partition land in the default partition,
+    which is slow to split later, so partitions are created PARTITIONS_AHEAD_MONTHS
+    months in advance. Does nothing outside of PostgreSQL.
+
+        Parameters:
+            months (int): Number of months after the current one to create partitions for.
+    """
+
+    help = "Creates the monthly partitions of the partitioned tables ahead of time."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months", type=int, default=settings.PARTITIONS_AHEAD_MONTHS
+        )
+
+    def handle(self, *args, **options):
+        current = timezone.now().date()
+        created = 0
+        for table in partitions.PARTITIONED_TABLES:
+            if not partitions.is_partitioned(table):
+                self.stdout.write(f"{table} is not partitioned, skipped.")
+                continue
+            for offset in range(options["months"] + 1):
+                month = partitions.add_months(current, offset)
+                with transaction.atomic():
+                    if partitions.create_partition(table, month):
+                        created += 1
+                        self.stdout.write(
+                            f"Created {partitions.partition_name(table, month)}."
+                        )
+        self.stdout.write(self.style.SUCCESS(f"Done, {created} partitions created."))
@@ -0,0 +1,112 @@
+import os
+import sys
+import subprocess
+from statistics import median
+from time import perf_counter
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Reports the slowest imports and the cold start time of the project, like python -X importtime.
+
+    Every measurement runs in a fresh interpreter, so the numbers are those of
+    a cold start and not of the already loaded current process.
+
+        Parameters:
+            target (str): What to start, "setup", "check", "wsgi" or "urls".
+            limit (int): Number of modules in the report.
+            sort (str): Sort by "self" or "cumulative" import time.
+            prefix (str): Only report modules starting with it, e.g. "app".
+            repeat (int): Number of cold starts to time.
+    """
+
+    help = "Reports the slowest imports and the cold start time of the project."
+    requires_system_checks = []
+
+    targets = {
+        "setup": ["-c", "import django; django.setup()"],
+        "check": ["manage.py", "check"],
+        "wsgi": ["-c", "import settings.wsgi"],
+        "urls": [
+            "-c",
+            "import settings.wsgi; from django.urls import get_resolver; "
+            "get_resolver().url_patterns",
+        ],
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=self.targets, default="check")
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument("--sort", choices=("self", "cumulative"), default="self")
+        parser.add_argument("--prefix", default="")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def run(self, *options: str) -> subprocess.CompletedProcess:
+        """
+        Runs the target in a fresh interpreter from the project directory.
+
+            Parameters:
+                options (str): Interpreter options and arguments.
+
+            Returns:
+                (CompletedProcess): Finished process with captured output.
+        """
+
+        env = {"DJANGO_SETTINGS_MODULE": "settings.settings", **os.environ}
+        return subprocess.run(
+            [sys.executable, *options],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    def parse(self, output: str) -> list[tuple]:
+        """
+        Parses the -X importtime output.
+
+            Parameters:
+                output (str): Standard error of the interpreter.
+
+            Returns:
+                (list[tuple[int, int, str]]): Self and cumulative microseconds and name of every module.
+        """
+
+        modules = []
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            own, cumulative, name = line[len("import time:") :].split("|")
+            modules.append((int(own), int(cumulative), name.strip()))
+        return modules
+
+    def handle(self, *args, **options):
+        target = self.targets[options["target"]]
+        process = self.run("-X", "importtime", *target)
+        modules = [
+            module
+            for module in self.parse(process.stderr)
+            if module[2].startswith(options["prefix"])
+        ]
+        index = 0 if options["sort"] == "self" else 1
+        modules.sort(key=lambda module: module[index], reverse=True)
+        self.stdout.write(f"{'self ms':>10}{'cumul. ms':>11}  module")
+        for own, cumulative, name in modules[: options["limit"]]:
+            self.stdout.write(f"{own / 1000:>10.1f}{cumulative / 1000:>11.1f}  {name}")
+
+        timings = []
+        for _ in range(options["repeat"]):
+            started = perf_counter()
+            process = self.run(*target)
+            timings.append((perf_counter() - started) * 1000)
+            if process.returncode:
+                self.stderr.write(process.stderr)
+                return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cold start of {options['target']}: min {min(timings):.0f} ms, "
+                f"median {median(timings):.0f} ms over {len(timings)} runs."
+            )
+        )
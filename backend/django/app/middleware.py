@@ -0,0 +1,166 @@
+import gzip
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+from app import limits
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def accepted_encodings(request: HttpRequest) -> set[str]:
+    """
+    Returns the content encodings accepted by the client.
+
+    Encodings refused with q=0 and values with an invalid quality are left out.
+
+        Parameters:
+            request (HttpRequest): The request object.
+
+        Returns:
+            (set[str]): Lowercase encoding names.
+    """
+
+    header = request.headers.get("Accept-Encoding", "").replace(" ", "")
+    accepted = set()
+    for value in header.split(","):
+        name, _, quality = value.partition(";q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        if name:
+            accepted.add(name.lower())
+    return accepted
+
+
+class PrimaryPinMiddleware:
+    """
+    Pins the client to the primary database for a while after a successful write.
+
+    Sets a short-lived cookie on responses to unsafe requests, read_from_replica
+    handlers skip the replicas while it is present.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if (
+            settings.REPLICA_DATABASES
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class BodySizeMiddleware:
+    """
+    Rejects bodies over the limit of handlers decorated with max_body_size.
+
+    Runs before the view, so neither authentication nor the CSRF check read
+    or parse a body that is going to be rejected.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.get_response(request)
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS:
+            return None
+        limit = limits.get_limit(view_func, request.method)
+        if limit is None:
+            return None
+        error = limits.check_body_size(request, limit)
+        if error is None:
+            return None
+        message, status_code = error
+        return JsonResponse({"error": message}, status=status_code)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best encoding accepted by the client.
+
+    Supports zstd and brotli when the zstandard and brotli packages are
+    installed, and gzip. Only responses of COMPRESSION_CONTENT_TYPES larger than
+    COMPRESSION_MIN_SIZE bytes are compressed, smaller ones cost more CPU than
+    they save on the wire.
+
+    HTML is never compressed, as pages such as the admin embed the CSRF token
+    next to text reflected from the request, and the compressed size would
+    reveal the token (BREACH). For the same reason responses setting cookies
+    are sent as they are.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encoders = {"gzip": lambda content: gzip.compress(content, 6, mtime=0)}
+        if brotli is not None:
+            self.encoders["br"] = lambda content: brotli.compress(content, quality=5)
+        if zstandard is not None:
+            compressor = zstandard.ZstdCompressor(level=3)
+            self.encoders["zstd"] = compressor.compress
+
+    def get_encoding(self, request: HttpRequest) -> str | None:
+        """
+        Returns the preferred encoding accepted by the client.
+
+            Parameters:
+                request (HttpRequest): The request object.
+
+            Returns:
+                (str or None): Encoding name or None if no supported encoding is accepted.
+        """
+
+        accepted = accepted_encodings(request)
+        for encoding in ("zstd", "br", "gzip"):
+            if encoding in accepted and encoding in self.encoders:
+                return encoding
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES or response.cookies:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        encoding = self.get_encoding(request)
+        if encoding is None:
+            return response
+        compressed = self.encoders[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Min
+
+
+def remove_duplicate_profiles(apps, schema_editor):
+    """
+    Keeps the oldest profile of every user and deletes the rest, so that the
+    user column can be made unique.
+    """
+
+    Profile = apps.get_model("app", "Profile")
+    db_alias = schema_editor.connection.alias
+    keep_ids = (
+        Profile.objects.using(db_alias)
+        .values("user_id")
+        .annotate(keep_id=Min("id"))
+        .values("keep_id")
+    )
+    Profile.objects.using(db_alias).exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_profiles, migrations.RunPython.noop),
+    ]
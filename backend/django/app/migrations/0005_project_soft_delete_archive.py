@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0004_profile_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedComment",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "project_id",
+                    models.BigIntegerField(db_index=True, verbose_name="Project"),
+                ),
+                ("user_id", models.IntegerField(verbose_name="User")),
+                ("text", models.TextField(verbose_name="Text")),
+                (
+                    "images",
+                    models.JSONField(blank=True, default=list, verbose_name="Images"),
+                ),
+                (
+                    "files",
+                    models.JSONField(blank=True, default=list, verbose_name="Files"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Created At")),
+                ("updated_at", models.DateTimeField(verbose_name="Updated At")),
+            ],
+            options={
+                "verbose_name": "Archived Comment",
+                "verbose_name_plural": "Archived Comments",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedLike",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "project_id",
+                    models.BigIntegerField(db_index=True, verbose_name="Project"),
+                ),
+                ("user_id", models.IntegerField(verbose_name="User")),
+                ("is_like", models.BooleanField(verbose_name="Is Like")),
+            ],
+            options={
+                "verbose_name": "Archived Like",
+                "verbose_name_plural": "Archived Likes",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedProject",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("title", models.CharField(max_length=150, verbose_name="Title")),
+                (
+                    "description",
+                    models.TextField(blank=True, null=True, verbose_name="Description"),
+                ),
+                (
+                    "category_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="Category"
+                    ),
+                ),
+                (
+                    "status_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="Status"
+                    ),
+                ),
+                (
+                    "authors",
+                    models.JSONField(blank=True, default=list, verbose_name="Authors"),
+                ),
+                (
+                    "tags",
+                    models.JSONField(blank=True, default=list, verbose_name="Tags"),
+                ),
+                (
+                    "images",
+                    models.JSONField(blank=True, default=list, verbose_name="Images"),
+                ),
+                (
+                    "files",
+                    models.JSONField(blank=True, default=list, verbose_name="Files"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Created At")),
+                ("updated_at", models.DateTimeField(verbose_name="Updated At")),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Archived At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Project",
+                "verbose_name_plural": "Archived Projects",
+                "ordering": ("-archived_at",),
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedRating",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "project_id",
+                    models.BigIntegerField(db_index=True, verbose_name="Project"),
+                ),
+                ("user_id", models.IntegerField(verbose_name="User")),
+                ("value", models.IntegerField(verbose_name="Value")),
+                ("created_at", models.DateTimeField(verbose_name="Created At")),
+            ],
+            options={
+                "verbose_name": "Archived Rating",
+                "verbose_name_plural": "Archived Ratings",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at"],
+                name="project_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["updated_at"],
+                name="project_inactive_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicate_votes(apps, schema_editor):
+    """
+    Keeps the latest rating and like of every user per project and deletes the
+    rest, so that (user, project) can be made unique.
+    """
+
+    db_alias = schema_editor.connection.alias
+    for model_name in ("Rating", "Like"):
+        model = apps.get_model("app", model_name)
+        keep_ids = (
+            model.objects.using(db_alias)
+            .values("user_id", "project_id")
+            .annotate(keep_id=Max("id"))
+            .values("keep_id")
+        )
+        model.objects.using(db_alias).exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0005_project_soft_delete_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_votes, migrations.RunPython.noop),
+    ]
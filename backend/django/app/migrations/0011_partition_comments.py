@@ -0,0 +1,116 @@
+from datetime import date
+import django.db.models.deletion
+from django.db import migrations, models
+
+PARTITIONS_AHEAD_MONTHS = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_comments(apps, schema_editor):
+    """
+    Turns app_comment into a table partitioned by month of created_at.
+
+    The rows are copied into a new partitioned table with one partition per
+    month from the oldest comment up to PARTITIONS_AHEAD_MONTHS months ahead,
+    plus a default partition. The primary key becomes (id, created_at) and the
+    id keeps coming from a single sequence. Foreign keys from the comment
+    images and files tables are dropped, as PostgreSQL cannot reference a
+    partitioned table by id alone; Django deletes those rows itself.
+    """
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE app_comment IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = 'app_comment' "
+            "AND indexname <> 'app_comment_pkey'"
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'app_comment'::regclass AND contype = 'f'"
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT min(created_at), max(created_at), coalesce(max(id), 0) "
+            "FROM app_comment"
+        )
+        oldest, newest, last_id = cursor.fetchone()
+
+        cursor.execute("ALTER TABLE app_comment RENAME TO app_comment_unpartitioned")
+        cursor.execute(
+            "ALTER SEQUENCE app_comment_id_seq RENAME TO app_comment_unpartitioned_id_seq"
+        )
+        cursor.execute(
+            "ALTER INDEX app_comment_pkey RENAME TO app_comment_unpartitioned_pkey"
+        )
+        cursor.execute(
+            "CREATE TABLE app_comment (LIKE app_comment_unpartitioned "
+            "INCLUDING DEFAULTS INCLUDING STORAGE) PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute("CREATE SEQUENCE app_comment_id_seq OWNED BY app_comment.id")
+        cursor.execute("SELECT setval('app_comment_id_seq', %s + 1, false)", [last_id])
+        cursor.execute(
+            "ALTER TABLE app_comment "
+            "ALTER COLUMN id SET DEFAULT nextval('app_comment_id_seq'), "
+            "ADD CONSTRAINT app_comment_pkey PRIMARY KEY (id, created_at)"
+        )
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE app_comment ADD CONSTRAINT "{name}" {definition}'
+            )
+
+        today = date.today()
+        month = add_months(min(oldest.date(), today) if oldest else today, 0)
+        last = add_months(max(newest.date(), today) if newest else today, 0)
+        last = add_months(last, PARTITIONS_AHEAD_MONTHS)
+        while month <= last:
+            cursor.execute(
+                f'CREATE TABLE "app_comment_p{month:%Y_%m}" PARTITION OF app_comment '
+                "FOR VALUES FROM (%s) TO (%s)",
+                [f"{month} 00:00:00+00", f"{add_months(month, 1)} 00:00:00+00"],
+            )
+            month = add_months(month, 1)
+        cursor.execute(
+            "CREATE TABLE app_comment_default PARTITION OF app_comment DEFAULT"
+        )
+
+        cursor.execute(
+            "INSERT INTO app_comment SELECT * FROM app_comment_unpartitioned"
+        )
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute("DROP TABLE app_comment_unpartitioned CASCADE")
+        for definition in indexes:
+            cursor.execute(definition)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0010_admin_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_comments, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="comment",
+            name="project",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="app.project",
+                verbose_name="Project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["project", "-created_at"], name="comment_project_created_idx"
+            ),
+        ),
+    ]
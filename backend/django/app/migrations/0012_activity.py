@@ -0,0 +1,66 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0011_partition_comments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Activity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "user_id",
+                    models.IntegerField(blank=True, null=True, verbose_name="User"),
+                ),
+                ("project_id", models.BigIntegerField(verbose_name="Project")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                            ("commented", "Commented"),
+                            ("rated", "Rated"),
+                            ("liked", "Liked"),
+                        ],
+                        max_length=10,
+                        verbose_name="Action",
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="Changes",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Created At")),
+            ],
+            options={
+                "verbose_name": "Activity",
+                "verbose_name_plural": "Activities",
+                "indexes": [
+                    models.Index(
+                        fields=["project_id", "-id"], name="activity_project_idx"
+                    ),
+                    models.Index(fields=["user_id", "-id"], name="activity_user_idx"),
+                ],
+            },
+        ),
+    ]
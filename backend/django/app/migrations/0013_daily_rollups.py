@@ -0,0 +1,64 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0012_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("projects_by_category", "Projects created per category"),
+                            ("ratings_by_value", "Ratings per value"),
+                            ("ratings_by_department", "Ratings per department"),
+                            ("likes_by_department", "Likes per department"),
+                            ("comments_by_department", "Comments per department"),
+                        ],
+                        max_length=30,
+                        verbose_name="Metric",
+                    ),
+                ),
+                ("key", models.IntegerField(default=0, verbose_name="Key")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+            ],
+            options={
+                "verbose_name": "Daily Rollup",
+                "verbose_name_plural": "Daily Rollups",
+            },
+        ),
+        migrations.AddField(
+            model_name="like",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+                verbose_name="Created At",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "day", "key"),
+                name="daily_rollup_metric_day_key_unique",
+            ),
+        ),
+    ]
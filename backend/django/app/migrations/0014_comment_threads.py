@@ -0,0 +1,75 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+PATH_WIDTH = 12
+
+
+def fill_paths(apps, schema_editor):
+    """
+    Makes every existing comment a top-level comment with its zero-padded id as path.
+    """
+
+    if schema_editor.connection.vendor == "postgresql":
+        path = f"lpad(id::text, {PATH_WIDTH}, '0')"
+    else:
+        path = f"substr('{'0' * PATH_WIDTH}' || id, -{PATH_WIDTH}, {PATH_WIDTH})"
+    schema_editor.execute(f"UPDATE app_comment SET path = {path}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0013_daily_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedcomment",
+            name="parent_id",
+            field=models.BigIntegerField(blank=True, null=True, verbose_name="Parent"),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, verbose_name="Depth"),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="replies",
+                to="app.comment",
+                verbose_name="Parent",
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                blank=True, default="", max_length=255, verbose_name="Path"
+            ),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("depth", 0)),
+                fields=["project", "-created_at"],
+                name="comment_project_root_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["project", "path"],
+                name="comment_project_path_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0014_comment_threads"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedlike",
+            name="created_at",
+            field=models.DateTimeField(null=True, verbose_name="Created At"),
+        ),
+    ]
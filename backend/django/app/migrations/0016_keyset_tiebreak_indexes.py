@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0015_archivedlike_created_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_project_root_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="feeditem",
+            name="feed_item_user_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="project",
+            name="project_active_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("depth", 0)),
+                fields=["project", "-created_at", "-id"],
+                name="comment_project_root_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feeditem",
+            index=models.Index(
+                fields=["user", "-created_at", "-project"],
+                name="feed_item_user_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="project_active_created_idx",
+            ),
+        ),
+    ]
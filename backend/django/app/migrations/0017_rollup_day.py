@@ -0,0 +1,54 @@
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def record_rolled_up_days(apps, schema_editor):
+    """
+    Records every day from the first to the last day of the existing rollups,
+    so that the next run continues after them instead of starting over.
+    """
+
+    DailyRollup = apps.get_model("app", "DailyRollup")
+    RollupDay = apps.get_model("app", "RollupDay")
+    db_alias = schema_editor.connection.alias
+    days = DailyRollup.objects.using(db_alias).aggregate(
+        first=Min("day"), last=Max("day")
+    )
+    if days["first"] is None:
+        return
+    count = (days["last"] - days["first"]).days + 1
+    RollupDay.objects.using(db_alias).bulk_create(
+        [RollupDay(day=days["first"] + timedelta(days=n)) for n in range(count)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0016_keyset_tiebreak_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupDay",
+            fields=[
+                (
+                    "day",
+                    models.DateField(
+                        primary_key=True, serialize=False, verbose_name="Day"
+                    ),
+                ),
+                (
+                    "built_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Built At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Rollup Day",
+                "verbose_name_plural": "Rollup Days",
+            },
+        ),
+        migrations.RunPython(record_rolled_up_days, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models.signals import post_save
 from django.utils.text import slugify
 from django.contrib.auth.models import User
@@ -248,7 +249,7 @@ class Profile(models.Model):
     A model to represent a user profile.
     
         Fields:
-            user (ForeignKey): Foreign key to the user model.
+            user (OneToOneField): One-to-one link to the user model.
             birth_date (DateField): User's birth date.
             bio (TextField): User's biography.
             country (ForeignKey): Foreign key to the country model.
@@ -258,11 +259,12 @@ class Profile(models.Model):
             avatar (ImageField): User's avatar.
     """
 
-    user = models.ForeignKey(
+    user = models.OneToOneField(
         to=User,
         on_delete=models.CASCADE,
         null=False,
         blank=False,
+        related_name="profile",
         verbose_name="User",
     )
     birth_date = models.DateField(null=True, blank=True, verbose_name="Birth Date")
@@ -317,17 +319,36 @@ class Profile(models.Model):
 
     class Meta:
         app_label = "app"
-        ordering = ("user__first_name", "user__last_name")
+        indexes = [
+            models.Index(
+                fields=["department", "user"],
+                name="profile_department_user_idx",
+            ),
+            models.Index(
+                fields=["position", "user"],
+                name="profile_position_user_idx",
+            ),
+            models.Index(
+                fields=["city", "user"],
+                name="profile_city_user_idx",
+            ),
+        ]
         verbose_name = "Profile"
         verbose_name_plural = "Profiles"
 
+
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     """
     Creates a profile for a new user.
+
+    Only runs on the first save of a user, so later saves (e.g. the last_login
+    update on every login) do not cost an extra query. Raw saves from fixtures
+    are skipped, fixtures are expected to carry their own profiles.
     """
 
-    Profile.objects.get_or_create(user=instance)
+    if created and not kwargs.get("raw", False):
+        Profile.objects.create(user=instance)
 
 
 class Category(models.Model):
@@ -388,6 +409,46 @@ class Category(models.Model):
         verbose_name_plural = "Categories"
 
 
+class TagManager(models.Manager):
+    """
+    A manager for the tag model.
+
+        Methods:
+            get_or_create_many(): Returns the ids of the tags with the given names, creating missing ones.
+    """
+
+    def get_or_create_many(self, names) -> dict[str, int]:
+        """
+        Returns the ids of the tags with the given names, creating missing ones.
+
+        Slugs are computed once per name, missing tags are inserted with a single
+        INSERT that ignores conflicts with concurrent writers, and ids are read
+        back with a single SELECT. Names that map to the same slug share a tag.
+
+            Parameters:
+                names (Iterable[str]): Tag names or slugs.
+
+            Returns:
+                (dict[str, int]): Tag ids indexed by slug.
+        """
+
+        name_length = self.model._meta.get_field("name").max_length
+        slug_length = self.model._meta.get_field("slug").max_length
+        tags = {}
+        for name in names:
+            name = name.strip()
+            slug = slugify(name)
+            if not slug:
+                continue
+            if len(name) > name_length or len(slug) > slug_length:
+                raise ValueError(f"Tag name is too long: {name}.")
+            tags.setdefault(slug, self.model(name=name, slug=slug))
+        if not tags:
+            return {}
+        self.bulk_create(tags.values(), ignore_conflicts=True)
+        return dict(self.filter(slug__in=tags).values_list("slug", "id"))
+
+
 class Tag(models.Model):
     """
     A model to represent a tag.
@@ -400,6 +461,8 @@ class Tag(models.Model):
             save(): Overridden object save method, automatically generates a slug from the tag name.
     """
 
+    objects = TagManager()
+
     name = models.CharField(
         unique=True,
         max_length=100,
@@ -570,10 +633,22 @@ class Status(models.Model):
         verbose_name_plural = "Statuses"
 
 
+class ActiveProjectManager(models.Manager):
+    """
+    A manager for the project model that hides soft-deleted projects.
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(is_active=True)
+
+
 class Project(models.Model):
     """
     A model to represent a project.
 
+    The default manager "objects" only returns active projects, soft-deleted
+    projects are available through "all_objects" until they are archived.
+
         Fields:
             authors (ManyToManyField): Authors of the project.
             category (ForeignKey): Category of the project.
@@ -587,6 +662,10 @@ class Project(models.Model):
             updated_at (DateTimeField): Date and time when the project was updated.
             is_active (BooleanField): Whether the project is active or not.
             status (ForeignKey): Status of the project.
+
+        Managers:
+            objects (ActiveProjectManager): Active projects only.
+            all_objects (Manager): All projects, including soft-deleted ones.
     """
 
     authors = models.ManyToManyField(
@@ -659,6 +738,9 @@ class Project(models.Model):
         verbose_name="Status",
     )
 
+    objects = ActiveProjectManager()
+    all_objects = models.Manager()
+
     def __str__(self) -> str:
         """
         Returns a string representation of the project object.
@@ -672,6 +754,22 @@ class Project(models.Model):
     class Meta:
         app_label = "app"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="project_active_created_idx",
+            ),
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(is_active=False),
+                name="project_inactive_updated_idx",
+            ),
+            models.Index(
+                fields=["is_active", "id"],
+                name="project_is_active_idx",
+            ),
+        ]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
 
@@ -728,6 +826,18 @@ class Rating(models.Model):
     class Meta:
         app_label = "app"
         ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "project"],
+                name="rating_user_project_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["value", "id"],
+                name="rating_value_idx",
+            ),
+        ]
         verbose_name = "Rating"
         verbose_name_plural = "Ratings"
 
@@ -740,6 +850,7 @@ class Like(models.Model):
             user (ForeignKey): User who liked the project.
             project (ForeignKey): Project that was liked.
             is_like (BooleanField): Whether the project was liked or not.
+            created_at (DateTimeField): Date and time when the like was created.
     """
 
     user = models.ForeignKey(
@@ -757,6 +868,11 @@ class Like(models.Model):
         verbose_name="Project",
     )
     is_like = models.BooleanField(null=False, blank=True, verbose_name="Is Like")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        null=False,
+        verbose_name="Created At",
+    )
 
     def __str__(self) -> str:
         """
@@ -766,10 +882,22 @@ class Like(models.Model):
                 (str): A string in the format "Username - [Project ID] Project Title - Like or Dislike".
         """
 
-        return f"{self.user.username} - [{self.project.id}] {self.project.title} - {"Like" if self.is_like else "Dislike"}"
+        return f"{self.user.username} - [{self.project.id}] {self.project.title} - {'Like' if self.is_like else 'Dislike'}"
 
     class Meta:
         app_label = "app"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "project"],
+                name="like_user_project_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["is_like", "id"],
+                name="like_is_like_idx",
+            ),
+        ]
         verbose_name = "Like"
         verbose_name_plural = "Likes"
 
@@ -777,10 +905,26 @@ class Like(models.Model):
 class Comment(models.Model):
     """
     A model to represent a comment.
-    
+
+    On PostgreSQL the table is partitioned by month of created_at, see the
+    create_partitions command. The primary key of the table is (id, created_at),
+    ids stay unique as they come from a single sequence.
+
+    Replies form threads stored as materialized paths: the path of a comment is
+    the path of its parent followed by its own id, zero-padded to PATH_WIDTH
+    digits, so ordering by path lists a thread depth first and a subtree is a
+    single range of the (project, path) index, see app.threads. Paths only hold
+    digits, their order does not depend on the collation. The path and depth
+    are set when a comment is first saved. The parent has no database
+    constraint, as PostgreSQL cannot reference a partitioned table by id alone,
+    so deleting a comment deletes its subtree by path range instead.
+
         Fields:
             user (ForeignKey): User who commented the project.
             project (ForeignKey): Project that was commented.
+            parent (ForeignKey): Comment this comment replies to, None for top-level comments.
+            path (CharField): Ids of the top-level comment, the replies leading to this comment and this comment.
+            depth (PositiveSmallIntegerField): Number of ancestors of the comment.
             text (TextField): Text of the comment.
             images (ManyToManyField): Images of the comment.
             files (ManyToManyField): Files of the comment.
@@ -788,6 +932,8 @@ class Comment(models.Model):
             updated_at (DateTimeField): Date and time when the comment was updated.
     """
 
+    PATH_WIDTH = 12
+
     user = models.ForeignKey(
         to=User,
         on_delete=models.CASCADE,
@@ -798,10 +944,31 @@ class Comment(models.Model):
     project = models.ForeignKey(
         to=Project,
         on_delete=models.CASCADE,
+        db_index=False,
         null=False,
         blank=False,
         verbose_name="Project",
     )
+    parent = models.ForeignKey(
+        to="self",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="replies",
+        verbose_name="Parent",
+    )
+    path = models.CharField(
+        max_length=255,
+        default="",
+        blank=True,
+        verbose_name="Path",
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Depth",
+    )
     text = models.TextField(
         null=False, 
         blank=False, 
@@ -840,9 +1007,65 @@ class Comment(models.Model):
 
         return f"{self.user.username} - [{self.project.id}] {self.project.title} - {self.text[:30]}"
 
+    def save(self, *args, **kwargs) -> None:
+        """
+        Saves the comment, new comments get their path and depth from the parent.
+
+        The path holds the id of the comment, so it is written with a second
+        statement after the insert. The parent is read unless it is already
+        loaded.
+        """
+
+        from app import threads
+
+        super().save(*args, **kwargs)
+        if not self.path:
+            parent = self.parent
+            self.depth = parent.depth + 1 if parent else 0
+            self.path = threads.make_path(parent.path if parent else "", self.id)
+            Comment.objects.filter(id=self.id, created_at=self.created_at).update(
+                path=self.path, depth=self.depth
+            )
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict]:
+        """
+        Deletes the comment with all of its replies.
+
+        Replies are never older than the comment, so only the partitions from
+        its creation date on are scanned.
+
+            Returns:
+                (tuple[int, dict]): Number of deleted objects and number per model.
+        """
+
+        from app import threads
+
+        if not self.path:
+            return super().delete(*args, **kwargs)
+        return Comment.objects.filter(
+            threads.subtree(self.path),
+            project_id=self.project_id,
+            created_at__gte=self.created_at,
+        ).delete()
+
     class Meta:
         app_label = "app"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["project", "-created_at"],
+                name="comment_project_created_idx",
+            ),
+            models.Index(
+                fields=["project", "-created_at", "-id"],
+                condition=models.Q(depth=0),
+                name="comment_project_root_idx",
+            ),
+            models.Index(
+                fields=["project", "path"],
+                name="comment_project_path_idx",
+            ),
+        ]
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
 
@@ -968,3 +1191,553 @@ class ExtendedGroup(models.Model):
         verbose_name = "Extended Group"
         verbose_name_plural = "Extended Groups"
 
+
+class ArchivedProject(models.Model):
+    """
+    A model to represent an archived project.
+
+    Projects that stayed soft-deleted for a long time are moved here by the
+    archive_projects command, keeping the project table and its indexes small.
+    Related rows are stored by id, without foreign keys.
+
+        Fields:
+            id (BigIntegerField): ID of the original project.
+            title (CharField): Title of the project.
+            description (TextField): Description of the project.
+            category_id (BigIntegerField): ID of the category of the project.
+            status_id (BigIntegerField): ID of the status of the project.
+            authors (JSONField): IDs of the authors of the project.
+            tags (JSONField): IDs of the tags of the project.
+            images (JSONField): IDs of the images of the project.
+            files (JSONField): IDs of the files of the project.
+            created_at (DateTimeField): Date and time when the project was created.
+            updated_at (DateTimeField): Date and time when the project was updated.
+            archived_at (DateTimeField): Date and time when the project was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    title = models.CharField(max_length=150, verbose_name="Title")
+    description = models.TextField(null=True, blank=True, verbose_name="Description")
+    category_id = models.BigIntegerField(null=True, blank=True, verbose_name="Category")
+    status_id = models.BigIntegerField(null=True, blank=True, verbose_name="Status")
+    authors = models.JSONField(default=list, blank=True, verbose_name="Authors")
+    tags = models.JSONField(default=list, blank=True, verbose_name="Tags")
+    images = models.JSONField(default=list, blank=True, verbose_name="Images")
+    files = models.JSONField(default=list, blank=True, verbose_name="Files")
+    created_at = models.DateTimeField(verbose_name="Created At")
+    updated_at = models.DateTimeField(verbose_name="Updated At")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archived At")
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the archived project object.
+
+            Returns:
+                (str): A string in the format "[Project ID] Project Title - Archived At".
+        """
+
+        return f"[{self.id}] {self.title} - {self.archived_at}"
+
+    class Meta:
+        app_label = "app"
+        ordering = ("-archived_at",)
+        verbose_name = "Archived Project"
+        verbose_name_plural = "Archived Projects"
+
+
+class ArchivedComment(models.Model):
+    """
+    A model to represent a comment of an archived project.
+
+        Fields:
+            id (BigIntegerField): ID of the original comment.
+            project_id (BigIntegerField): ID of the archived project.
+            user_id (IntegerField): ID of the user who commented the project.
+            parent_id (BigIntegerField): ID of the comment this comment replies to.
+            text (TextField): Text of the comment.
+            images (JSONField): IDs of the images of the comment.
+            files (JSONField): IDs of the files of the comment.
+            created_at (DateTimeField): Date and time when the comment was created.
+            updated_at (DateTimeField): Date and time when the comment was updated.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    project_id = models.BigIntegerField(db_index=True, verbose_name="Project")
+    user_id = models.IntegerField(verbose_name="User")
+    parent_id = models.BigIntegerField(null=True, blank=True, verbose_name="Parent")
+    text = models.TextField(verbose_name="Text")
+    images = models.JSONField(default=list, blank=True, verbose_name="Images")
+    files = models.JSONField(default=list, blank=True, verbose_name="Files")
+    created_at = models.DateTimeField(verbose_name="Created At")
+    updated_at = models.DateTimeField(verbose_name="Updated At")
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the archived comment object.
+
+            Returns:
+                (str): A string in the format "[Project ID] Text (trimmed to 30 characters)".
+        """
+
+        return f"[{self.project_id}] {self.text[:30]}"
+
+    class Meta:
+        app_label = "app"
+        verbose_name = "Archived Comment"
+        verbose_name_plural = "Archived Comments"
+
+
+class ArchivedRating(models.Model):
+    """
+    A model to represent a rating of an archived project.
+
+        Fields:
+            id (BigIntegerField): ID of the original rating.
+            project_id (BigIntegerField): ID of the archived project.
+            user_id (IntegerField): ID of the user who rated the project.
+            value (IntegerField): Value of the rating.
+            created_at (DateTimeField): Date and time when the rating was created.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    project_id = models.BigIntegerField(db_index=True, verbose_name="Project")
+    user_id = models.IntegerField(verbose_name="User")
+    value = models.IntegerField(verbose_name="Value")
+    created_at = models.DateTimeField(verbose_name="Created At")
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the archived rating object.
+
+            Returns:
+                (str): A string in the format "[Project ID] Value".
+        """
+
+        return f"[{self.project_id}] {self.value}"
+
+    class Meta:
+        app_label = "app"
+        verbose_name = "Archived Rating"
+        verbose_name_plural = "Archived Ratings"
+
+
+class ArchivedLike(models.Model):
+    """
+    A model to represent a like of an archived project.
+
+        Fields:
+            id (BigIntegerField): ID of the original like.
+            project_id (BigIntegerField): ID of the archived project.
+            user_id (IntegerField): ID of the user who liked the project.
+            is_like (BooleanField): Whether the project was liked or not.
+            created_at (DateTimeField): Date and time when the like was created, empty for likes archived without it.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    project_id = models.BigIntegerField(db_index=True, verbose_name="Project")
+    user_id = models.IntegerField(verbose_name="User")
+    is_like = models.BooleanField(verbose_name="Is Like")
+    created_at = models.DateTimeField(null=True, verbose_name="Created At")
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the archived like object.
+
+            Returns:
+                (str): A string in the format "[Project ID] Like or Dislike".
+        """
+
+        return f"[{self.project_id}] {'Like' if self.is_like else 'Dislike'}"
+
+    class Meta:
+        app_label = "app"
+        verbose_name = "Archived Like"
+        verbose_name_plural = "Archived Likes"
+
+
+class FeedItem(models.Model):
+    """
+    A model to represent a project in the feed of a user.
+
+    Rows are written when a project is published to a small audience
+    (fan-out on write), so reading a feed is a range scan over one user.
+
+        Fields:
+            user (ForeignKey): User who sees the project.
+            project (ForeignKey): Project in the feed.
+            reason (CharField): Why the project is in the feed.
+            created_at (DateTimeField): Date and time when the project was created.
+    """
+
+    AUTHORED = "authored"
+    TAG = "tag"
+    GROUP = "group"
+    REASONS = (
+        (AUTHORED, "Authored"),
+        (TAG, "Shares tags with own projects"),
+        (GROUP, "From a group member"),
+    )
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="feed_items",
+        verbose_name="User",
+    )
+    project = models.ForeignKey(
+        to=Project,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="feed_items",
+        verbose_name="Project",
+    )
+    reason = models.CharField(
+        max_length=10,
+        choices=REASONS,
+        null=False,
+        blank=False,
+        verbose_name="Reason",
+    )
+    created_at = models.DateTimeField(
+        null=False,
+        verbose_name="Created At",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the feed item object.
+
+            Returns:
+                (str): A string in the format "Username - [Project ID] - Reason".
+        """
+
+        return f"{self.user_id} - [{self.project_id}] - {self.reason}"
+
+    class Meta:
+        app_label = "app"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "project"],
+                name="feed_item_user_project_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-project"],
+                name="feed_item_user_created_idx",
+            ),
+        ]
+        verbose_name = "Feed Item"
+        verbose_name_plural = "Feed Items"
+
+
+class FeedBroadcast(models.Model):
+    """
+    A model to represent a project published to an audience too large to fan out.
+
+    Such projects are matched against the reader when the feed is read
+    (fan-out on read) instead of being copied into every feed.
+
+        Fields:
+            project (OneToOneField): Project published to a large audience.
+            created_at (DateTimeField): Date and time when the project was created.
+    """
+
+    project = models.OneToOneField(
+        to=Project,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="feed_broadcast",
+        verbose_name="Project",
+    )
+    created_at = models.DateTimeField(
+        db_index=True,
+        null=False,
+        verbose_name="Created At",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the feed broadcast object.
+
+            Returns:
+                (str): A string in the format "[Project ID] - Created At".
+        """
+
+        return f"[{self.project_id}] - {self.created_at}"
+
+    class Meta:
+        app_label = "app"
+        verbose_name = "Feed Broadcast"
+        verbose_name_plural = "Feed Broadcasts"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A model to represent the stored response of a request sent with an Idempotency-Key header.
+
+    Retries with the same key and user get the stored response instead of
+    repeating the write, the row is created in the transaction of the write.
+
+        Fields:
+            user (ForeignKey): User who sent the request.
+            key (CharField): Value of the Idempotency-Key header.
+            fingerprint (CharField): Hash of the method, path and body of the request.
+            status_code (PositiveSmallIntegerField): Status code of the response.
+            response (JSONField): Data of the response.
+            created_at (DateTimeField): Date and time when the request was handled.
+    """
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        related_name="idempotency_keys",
+        verbose_name="User",
+    )
+    key = models.CharField(
+        max_length=255,
+        null=False,
+        blank=False,
+        verbose_name="Key",
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        null=False,
+        blank=False,
+        verbose_name="Fingerprint",
+    )
+    status_code = models.PositiveSmallIntegerField(
+        null=False,
+        verbose_name="Status Code",
+    )
+    response = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        verbose_name="Response",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name="Created At",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the idempotency key object.
+
+            Returns:
+                (str): A string in the format "User ID - Key".
+        """
+
+        return f"{self.user_id} - {self.key}"
+
+    class Meta:
+        app_label = "app"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"],
+                name="idempotency_key_user_key_unique",
+            ),
+        ]
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+
+
+class Activity(models.Model):
+    """
+    A model to represent an entry of the append-only activity log of projects.
+
+    Entries are never updated or deleted by the application, they are written
+    in batches by app.activity and keep plain ids, so the log outlives archived
+    or deleted projects and inserts do not check foreign keys.
+
+        Fields:
+            user_id (IntegerField): Id of the user who acted, None for system actions.
+            project_id (BigIntegerField): Id of the project.
+            action (CharField): What happened.
+            changes (JSONField): Details of the action, e.g. old and new values of changed fields.
+            created_at (DateTimeField): Date and time of the action.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    COMMENTED = "commented"
+    RATED = "rated"
+    LIKED = "liked"
+    ACTIONS = (
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (DELETED, "Deleted"),
+        (COMMENTED, "Commented"),
+        (RATED, "Rated"),
+        (LIKED, "Liked"),
+    )
+
+    user_id = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="User",
+    )
+    project_id = models.BigIntegerField(
+        null=False,
+        verbose_name="Project",
+    )
+    action = models.CharField(
+        max_length=10,
+        choices=ACTIONS,
+        null=False,
+        blank=False,
+        verbose_name="Action",
+    )
+    changes = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        verbose_name="Changes",
+    )
+    created_at = models.DateTimeField(
+        null=False,
+        verbose_name="Created At",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the activity object.
+
+            Returns:
+                (str): A string in the format "User ID - Action - [Project ID]".
+        """
+
+        return f"{self.user_id} - {self.action} - [{self.project_id}]"
+
+    class Meta:
+        app_label = "app"
+        indexes = [
+            models.Index(
+                fields=["project_id", "-id"],
+                name="activity_project_idx",
+            ),
+            models.Index(
+                fields=["user_id", "-id"],
+                name="activity_user_idx",
+            ),
+        ]
+        verbose_name = "Activity"
+        verbose_name_plural = "Activities"
+
+
+class DailyRollup(models.Model):
+    """
+    A model to represent a pre-aggregated daily count for the analytics endpoint.
+
+    Rows are written by the build_rollups command for complete days only, one
+    row per day, metric and key, so analytics never scan the source tables.
+
+        Fields:
+            day (DateField): Day of the count.
+            metric (CharField): What is counted.
+            key (IntegerField): Category id, rating value or department id, 0 if none.
+            count (PositiveIntegerField): Number of events.
+    """
+
+    PROJECTS_BY_CATEGORY = "projects_by_category"
+    RATINGS_BY_VALUE = "ratings_by_value"
+    RATINGS_BY_DEPARTMENT = "ratings_by_department"
+    LIKES_BY_DEPARTMENT = "likes_by_department"
+    COMMENTS_BY_DEPARTMENT = "comments_by_department"
+    METRICS = (
+        (PROJECTS_BY_CATEGORY, "Projects created per category"),
+        (RATINGS_BY_VALUE, "Ratings per value"),
+        (RATINGS_BY_DEPARTMENT, "Ratings per department"),
+        (LIKES_BY_DEPARTMENT, "Likes per department"),
+        (COMMENTS_BY_DEPARTMENT, "Comments per department"),
+    )
+
+    day = models.DateField(
+        null=False,
+        verbose_name="Day",
+    )
+    metric = models.CharField(
+        max_length=30,
+        choices=METRICS,
+        null=False,
+        blank=False,
+        verbose_name="Metric",
+    )
+    key = models.IntegerField(
+        default=0,
+        null=False,
+        verbose_name="Key",
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        null=False,
+        verbose_name="Count",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the daily rollup object.
+
+            Returns:
+                (str): A string in the format "Day - Metric - Key: Count".
+        """
+
+        return f"{self.day} - {self.metric} - {self.key}: {self.count}"
+
+    class Meta:
+        app_label = "app"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric", "day", "key"],
+                name="daily_rollup_metric_day_key_unique",
+            ),
+        ]
+        verbose_name = "Daily Rollup"
+        verbose_name_plural = "Daily Rollups"
+
+
+class RollupDay(models.Model):
+    """
+    A model to represent a day that was rolled up by the build_rollups command.
+
+    Days without any event have no DailyRollup rows, so the rolled up days are
+    recorded here and the next run starts after the last one of them instead of
+    after the last day with events.
+
+        Fields:
+            day (DateField): The rolled up day.
+            built_at (DateTimeField): Date and time when the day was last rolled up.
+    """
+
+    day = models.DateField(
+        primary_key=True,
+        verbose_name="Day",
+    )
+    built_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Built At",
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the rollup day object.
+
+            Returns:
+                (str): A string in the format "Day - Built At".
+        """
+
+        return f"{self.day} - {self.built_at}"
+
+    class Meta:
+        app_label = "app"
+        verbose_name = "Rollup Day"
+        verbose_name_plural = "Rollup Days"
@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Callable
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Page number pagination for list endpoints.
+
+        Parameters:
+            page (int): Page number, starting from 1.
+            page_size (int): Number of items per page, PAGE_SIZE by default, up to MAX_PAGE_SIZE.
+    """
+
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def get_meta(self) -> dict:
+        """
+        Returns the pagination metadata of the current page.
+
+            Returns:
+                (dict): Total count, current page and links to the next and previous pages.
+        """
+
+        return {
+            "count": self.page.paginator.count,
+            "page": self.page.number,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+
+
+def parse_id(value: str) -> int | None:
+    """
+    Parses an id cursor.
+
+        Parameters:
+            value (str): Raw value.
+
+        Returns:
+            (int or None): Id, None if the value is not a positive integer.
+    """
+
+    return int(value) if value.isdigit() else None
+
+
+def parse_keyset(value: str) -> tuple[datetime, int] | None:
+    """
+    Parses a creation date and id cursor made by make_keyset.
+
+        Parameters:
+            value (str): Raw value.
+
+        Returns:
+            (tuple[datetime, int] or None): Creation date and id, None if the value is not such a cursor.
+    """
+
+    created_at, _, id = value.rpartition("_")
+    created_at = parse_datetime(created_at) if created_at else None
+    if created_at is None or not id.isdigit():
+        return None
+    return created_at, int(id)
+
+
+def make_keyset(created_at: datetime, id: int) -> str:
+    """
+    Returns the cursor of a row ordered by creation date and id, newest first.
+
+        Parameters:
+            created_at (datetime): Creation date of the row.
+            id (int): Id of the row.
+
+        Returns:
+            (str): ISO date and time and id separated by an underscore.
+    """
+
+    return f"{created_at.isoformat()}_{id}"
+
+
+def before_keyset(
+    before: tuple[datetime, int], field: str = "created_at", id_field: str = "id"
+) -> Q:
+    """
+    Returns a filter of the rows after the cursor in the (-created_at, -id) order.
+
+    Rows created at the same moment as the cursor are told apart by id, so ties
+    at the end of a page are neither skipped nor repeated on the next one.
+
+        Parameters:
+            before (tuple[datetime, int]): Creation date and id of the last row of the previous page.
+            field (str): Name of the creation date field.
+            id_field (str): Name of the id field.
+
+        Returns:
+            (Q): Filter of the following rows.
+    """
+
+    created_at, id = before
+    return Q(**{f"{field}__lt": created_at}) | Q(
+        **{field: created_at, f"{id_field}__lt": id}
+    )
+
+
+def get_limit(request: Request, default: int, maximum: int) -> int:
+    """
+    Returns the page size of a keyset paginated endpoint, between 1 and the maximum.
+
+        Parameters:
+            request (Request): The request object.
+            default (int): Page size without the limit parameter.
+            maximum (int): Largest page size.
+
+        Returns:
+            (int): Page size.
+    """
+
+    try:
+        limit = int(request.query_params.get("limit", default))
+    except ValueError:
+        raise Exception("limit must be an integer.")
+    return max(1, min(limit, maximum))
+
+
+def get_cursor(
+    request: Request,
+    default: int,
+    maximum: int,
+    parse: Callable[[str], object] = parse_keyset,
+) -> tuple[object | None, int]:
+    """
+    Returns the before cursor and the page size of a keyset paginated endpoint.
+
+        Parameters:
+            request (Request): The request object.
+            default (int): Page size without the limit parameter.
+            maximum (int): Largest page size.
+            parse (Callable): Parser of the cursor returning None for invalid values, creation date and id by default.
+
+        Returns:
+            (tuple[object or None, int]): Parsed cursor, None on the first page, and page size.
+    """
+
+    raw = request.query_params.get("before", None)
+    before = None
+    if raw:
+        try:
+            before = parse(raw)
+        except ValueError:
+            pass
+        if before is None:
+            raise Exception("before must be the next cursor of a previous page.")
+    return before, get_limit(request, default, maximum)
+
+
+def get_next(items: list, limit: int, cursor: Callable[[object], object]) -> object:
+    """
+    Returns the cursor of the next page, None on the last page.
+
+        Parameters:
+            items (list): Items of the current page.
+            limit (int): Page size.
+            cursor (Callable): Returns the cursor of an item.
+
+        Returns:
+            (object or None): Cursor of the last item if the page is full.
+    """
+
+    return cursor(items[-1]) if items and len(items) == limit else None
@@ -0,0 +1,85 @@
+from datetime import date
+from django.db import connection
+
+PARTITIONED_TABLES = ("app_comment",)
+
+
+def add_months(month: date, count: int) -> date:
+    """
+    Returns the first day of the month count months after the given one.
+
+        Parameters:
+            month (date): Any day of the starting month.
+            count (int): Number of months to add, may be negative.
+
+        Returns:
+            (date): First day of the resulting month.
+    """
+
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Returns the name of the monthly partition of the table, e.g. "app_comment_p2024_05".
+
+        Parameters:
+            table (str): Name of the partitioned table.
+            month (date): Any day of the month.
+
+        Returns:
+            (str): Name of the partition.
+    """
+
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(table: str) -> bool:
+    """
+    Returns whether the table is partitioned, always False outside of PostgreSQL.
+
+        Parameters:
+            table (str): Name of the table.
+
+        Returns:
+            (bool): True if the table is partitioned.
+    """
+
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def create_partition(table: str, month: date) -> bool:
+    """
+    Creates the monthly partition of the table unless it exists already.
+
+    Boundaries are UTC midnights, the partition holds rows from the first day
+    of the month up to, not including, the first day of the next one.
+
+        Parameters:
+            table (str): Name of the partitioned table.
+            month (date): Any day of the month.
+
+        Returns:
+            (bool): True if the partition was created.
+    """
+
+    name = partition_name(table, month)
+    start = add_months(month, 0)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        cursor.execute(
+            f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+            "FOR VALUES FROM (%s) TO (%s)",
+            [f"{start} 00:00:00+00", f"{add_months(start, 1)} 00:00:00+00"],
+        )
+    return True
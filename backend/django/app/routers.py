@@ -0,0 +1,65 @@
+from contextvars import ContextVar
+from functools import wraps
+from random import choice
+from django.conf import settings
+
+replica = ContextVar("replica", default=None)
+
+
+class ReplicaRouter:
+    """
+    A database router that sends reads to the replicas and everything else to the primary.
+
+    Reads only go to a replica inside read_from_replica handlers, all other code
+    (authentication, write paths, management commands) keeps reading the primary.
+    The replica is picked once per handler call, so all reads of a request see
+    the same replication lag.
+
+        Methods:
+            db_for_read(): Returns the replica of the current request for replica reads, otherwise the primary.
+            db_for_write(): Returns the primary.
+            allow_relation(): Allows relations between objects of any database.
+            allow_migrate(): Allows migrations on the primary only.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        return replica.get() or "default"
+
+    def db_for_write(self, model, **hints) -> str:
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == "default"
+
+
+def read_from_replica(method):
+    """
+    Decorator for safe view handlers that may read from the replicas.
+
+    Clients that wrote recently carry the primary pin cookie set by
+    PrimaryPinMiddleware and keep reading from the primary, so they see their
+    own writes despite the replication lag.
+
+        Parameters:
+            method (Callable): View handler taking the request as the first argument after self.
+
+        Returns:
+            (Callable): Wrapped view handler.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if not settings.REPLICA_DATABASES or request.COOKIES.get(
+            settings.REPLICA_PIN_COOKIE
+        ):
+            return method(self, request, *args, **kwargs)
+        token = replica.set(choice(settings.REPLICA_DATABASES))
+        try:
+            return method(self, request, *args, **kwargs)
+        finally:
+            replica.reset(token)
+
+    return wrapper
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from app import models
+from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import default_storage
+from app import models, lookups
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -79,7 +82,7 @@ class ProjectSerializer(serializers.ModelSerializer):
                 (str or None): Category name of the project or None if no category.
         """
 
-        return obj.category.name if obj.category else None
+        return lookups.categories.name(obj.category_id)
 
     def get_tags(self, obj):
         """
@@ -131,7 +134,62 @@ class ProjectSerializer(serializers.ModelSerializer):
                 (str or None): Status name of the project or None if no status.
         """
 
-        return obj.status.name if obj.status else None
+        return lookups.statuses.name(obj.status_id)
+
+
+class ProjectCardSerializer(serializers.Serializer):
+    """
+    Serializer for the project cards returned by cards.read().
+
+        Fields:
+            id (int): ID of the project.
+            title (str): Title of the project.
+            category (str): Category of the project.
+            image (str): URL of the cover image of the project.
+            likes (int): Number of likes of the project.
+            comments (int): Number of comments of the project.
+            rating (float): Average rating of the project.
+            created_at (datetime): Date and time when the project was created.
+
+        Methods:
+            get_category(): Returns the category of the project.
+            get_image(): Returns the URL of the cover image of the project.
+    """
+
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    category = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
+    likes = serializers.IntegerField()
+    comments = serializers.IntegerField()
+    rating = serializers.FloatField(allow_null=True)
+    created_at = serializers.DateTimeField()
+
+    def get_category(self, obj):
+        """
+        Returns the category of the project.
+
+            Parameters:
+                obj (dict): The project card.
+
+            Returns:
+                (str or None): Category name of the project or None if no category.
+        """
+
+        return lookups.categories.name(obj["category_id"])
+
+    def get_image(self, obj):
+        """
+        Returns the URL of the cover image of the project.
+
+            Parameters:
+                obj (dict): The project card.
+
+            Returns:
+                (str or None): URL of the first image of the project or None if no images.
+        """
+
+        return default_storage.url(obj["image"]) if obj["image"] else None
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -143,6 +201,8 @@ class CommentSerializer(serializers.ModelSerializer):
             user (int): User who commented the project.
             username (str): Username of the comment author.
             project (int): Project that was commented.
+            parent (int): Comment this comment replies to.
+            depth (int): Number of ancestors of the comment.
             text (str): Text of the comment.
             images (list[str]): List of image urls of the comment.
             files (list[str]): List of file urls of the comment.
@@ -164,7 +224,10 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "user",
+            "username",
             "project",
+            "parent",
+            "depth",
             "text",
             "images",
             "files",
@@ -210,3 +273,224 @@ class CommentSerializer(serializers.ModelSerializer):
         """
 
         return [str(file.url) for file in obj.files.all()] if obj.files else None
+
+
+class UserSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the User model with its profile.
+
+    Expects the profile to be loaded with select_related("profile"), country, city,
+    department and position names are taken from the lookup tables in app.lookups,
+    so that no query is made per user. The email is only included for the user
+    themselves and for staff, the request is taken from the context.
+
+        Fields:
+            id (int): ID of the user.
+            username (str): Username of the user.
+            first_name (str): First name of the user.
+            last_name (str): Last name of the user.
+            email (str): Email of the user, only for the user and staff.
+            birth_date (date): Birth date of the user.
+            bio (str): Biography of the user.
+            country (str): Country of the user.
+            city (str): City of the user.
+            department (str): Department of the user.
+            position (str): Position of the user.
+            avatar (str): Avatar url of the user.
+
+        Methods:
+            to_representation(): Returns the user, without the email for other users.
+            get_profile(): Returns the profile of the user.
+            get_birth_date(): Returns the birth date of the user.
+            get_bio(): Returns the biography of the user.
+            get_country(): Returns the country of the user.
+            get_city(): Returns the city of the user.
+            get_department(): Returns the department of the user.
+            get_position(): Returns the position of the user.
+            get_avatar(): Returns the avatar url of the user.
+    """
+
+    birth_date = serializers.SerializerMethodField()
+    bio = serializers.SerializerMethodField()
+    country = serializers.SerializerMethodField()
+    city = serializers.SerializerMethodField()
+    department = serializers.SerializerMethodField()
+    position = serializers.SerializerMethodField()
+    avatar = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "username",
+            "first_name",
+            "last_name",
+            "email",
+            "birth_date",
+            "bio",
+            "country",
+            "city",
+            "department",
+            "position",
+            "avatar",
+        ]
+
+    def to_representation(self, instance):
+        """
+        Returns the user, without the email unless the requester is the user or staff.
+
+            Parameters:
+                instance (User): The user object.
+
+            Returns:
+                (dict): Serialized user.
+        """
+
+        data = super().to_representation(instance)
+        request = self.context.get("request")
+        viewer = getattr(request, "user", None)
+        if not viewer or not (viewer.is_staff or viewer.pk == instance.pk):
+            data.pop("email", None)
+        return data
+
+    def get_profile(self, obj):
+        """
+        Returns the profile of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (Profile or None): Profile of the user or None if no profile.
+        """
+
+        try:
+            return obj.profile
+        except ObjectDoesNotExist:
+            return None
+
+    def get_birth_date(self, obj):
+        """
+        Returns the birth date of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (date or None): Birth date of the user or None if no profile.
+        """
+
+        profile = self.get_profile(obj)
+        return profile.birth_date if profile else None
+
+    def get_bio(self, obj):
+        """
+        Returns the biography of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): Biography of the user or None if no profile.
+        """
+
+        profile = self.get_profile(obj)
+        return profile.bio if profile else None
+
+    def get_country(self, obj):
+        """
+        Returns the country of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): Country name of the user or None if no country.
+        """
+
+        profile = self.get_profile(obj)
+        return lookups.countries.name(profile.country_id) if profile else None
+
+    def get_city(self, obj):
+        """
+        Returns the city of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): City name of the user or None if no city.
+        """
+
+        profile = self.get_profile(obj)
+        return lookups.cities.name(profile.city_id) if profile else None
+
+    def get_department(self, obj):
+        """
+        Returns the department of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): Department name of the user or None if no department.
+        """
+
+        profile = self.get_profile(obj)
+        return lookups.departments.name(profile.department_id) if profile else None
+
+    def get_position(self, obj):
+        """
+        Returns the position of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): Position name of the user or None if no position.
+        """
+
+        profile = self.get_profile(obj)
+        return lookups.positions.name(profile.position_id) if profile else None
+
+    def get_avatar(self, obj):
+        """
+        Returns the avatar url of the user.
+
+            Parameters:
+                obj (User): The user object.
+
+            Returns:
+                (str or None): Avatar url of the user or None if no profile.
+        """
+
+        profile = self.get_profile(obj)
+        return str(profile.avatar) if profile else None
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Activity model.
+
+        Fields:
+            id (int): ID of the activity.
+            user (int): Id of the user who acted.
+            project (int): Id of the project.
+            action (str): What happened.
+            changes (dict): Details of the action.
+            created_at (datetime): Date and time of the action.
+    """
+
+    user = serializers.IntegerField(source="user_id", read_only=True)
+    project = serializers.IntegerField(source="project_id", read_only=True)
+
+    class Meta:
+        model = models.Activity
+        fields = [
+            "id",
+            "user",
+            "project",
+            "action",
+            "changes",
+            "created_at",
+        ]
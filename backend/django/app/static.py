@@ -0,0 +1,83 @@
+import re
+import posixpath
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views.static import serve
+from app.middleware import accepted_encodings
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def static_file(request: HttpRequest, path: str) -> HttpResponse:
+    """
+    Serves a collected static file.
+
+    Picks a precompressed .br or .gz variant when the client accepts it, as
+    negotiated from the q-values of Accept-Encoding. Files with a content hash
+    in the name never change and are cached for a year as immutable, other
+    files for STATIC_MAX_AGE seconds. The file is returned as a FileResponse,
+    so the WSGI server can send it with sendfile, but it still occupies a
+    worker: in production the front proxy should serve STATIC_ROOT itself
+    and only pass misses on to this view.
+
+        Parameters:
+            request (HttpRequest): The request object.
+            path (str): Path of the file relative to STATIC_ROOT.
+
+        Returns:
+            (HttpResponse): File response.
+    """
+
+    accepted = accepted_encodings(request)
+    response = None
+    for encoding, extension in PRECOMPRESSED:
+        if encoding in accepted:
+            try:
+                response = serve(request, path + extension, settings.STATIC_ROOT)
+                break
+            except Http404:
+                continue
+    if response is None:
+        response = serve(request, path, settings.STATIC_ROOT)
+    if HASHED_NAME.search(path):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={settings.STATIC_MAX_AGE}"
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def media_file(request: HttpRequest, path: str) -> HttpResponse:
+    """
+    Serves an uploaded media file.
+
+    With MEDIA_SENDFILE_HEADER set, only the X-Accel-Redirect (nginx) or
+    X-Sendfile (Apache, lighttpd) header is returned and the web server sends the
+    file itself, otherwise the file is returned as a FileResponse.
+
+        Parameters:
+            request (HttpRequest): The request object.
+            path (str): Path of the file relative to MEDIA_ROOT.
+
+        Returns:
+            (HttpResponse): Offload or file response.
+    """
+
+    header = settings.MEDIA_SENDFILE_HEADER
+    if not header:
+        return serve(request, path, settings.MEDIA_ROOT)
+    path = posixpath.normpath(path).lstrip("/")
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404()
+    response = HttpResponse(content_type="")
+    if header == "X-Accel-Redirect":
+        response[header] = settings.MEDIA_SENDFILE_PREFIX + path
+    else:
+        response[header] = str(fullpath)
+    return response
@@ -1 +1,1123 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from time import monotonic, sleep
+from types import SimpleNamespace
+from io import StringIO
+from os import environ
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management import call_command, load_command_class
+from django.db import IntegrityError, OperationalError, connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app import analytics, cards, feed, lookups, models, partitions, versions, votes
+from app.activity import ActivityBuffer
+from app.admin import EstimatedCountPaginator
+from app.management.commands import profile_imports
+from app.middleware import PrimaryPinMiddleware
+from app.routers import ReplicaRouter, read_from_replica
+from app.static import static_file
+from app.throttling import TokenBucketThrottle
+from app.views import ProjectList
+from app.votes import VoteBuffer
+from settings import config
+
+
+class Clock:
+    """
+    Manually advanced replacement of time.time.
+    """
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.clock = Clock()
+        self.view = SimpleNamespace(throttle_scope="write")
+        self.request = SimpleNamespace(
+            method="POST",
+            user=AnonymousUser(),
+            META={"REMOTE_ADDR": "10.0.0.1"},
+        )
+
+    def throttle(self) -> TokenBucketThrottle:
+        throttle = TokenBucketThrottle()
+        throttle.THROTTLE_RATES = {"write": "30/min"}
+        return throttle
+
+    def allow(self) -> bool:
+        throttle = self.throttle()
+        with mock.patch.object(throttle, "timer", self.clock):
+            return throttle.allow_request(self.request, self.view)
+
+    def test_burst_is_capacity(self):
+        allowed = sum(self.allow() for _ in range(40))
+        self.assertEqual(allowed, 30)
+
+    def test_refills_from_elapsed_time(self):
+        for _ in range(30):
+            self.allow()
+        self.assertFalse(self.allow())
+        self.clock.now += 2
+        self.assertTrue(self.allow())
+        self.assertFalse(self.allow())
+
+    def test_sustained_rate(self):
+        allowed = 0
+        for _ in range(3000):
+            allowed += self.allow()
+            self.clock.now += 0.1
+        self.assertLessEqual(allowed, 30 + 150 + 1)
+        self.assertGreaterEqual(allowed, 30 + 150 - 1)
+
+    def test_forwarded_for_is_not_trusted_without_proxies(self):
+        for index in range(40):
+            self.request.META["HTTP_X_FORWARDED_FOR"] = f"10.1.0.{index}"
+            self.allow()
+        self.assertFalse(self.allow())
+
+    def test_bulk_scope_for_ids(self):
+        view = ProjectList()
+        request = SimpleNamespace(method="GET", query_params={"ids": "1,2"})
+        self.assertEqual(TokenBucketThrottle().get_scope(request, view), "bulk")
+        request = SimpleNamespace(method="GET", query_params={})
+        self.assertEqual(TokenBucketThrottle().get_scope(request, view), "default")
+        request = SimpleNamespace(method="POST", query_params={})
+        self.assertEqual(TokenBucketThrottle().get_scope(request, view), "write")
+
+    def test_wait_until_next_token(self):
+        throttle = self.throttle()
+        with mock.patch.object(throttle, "timer", self.clock):
+            for _ in range(30):
+                throttle.allow_request(self.request, self.view)
+            self.assertFalse(throttle.allow_request(self.request, self.view))
+        self.assertAlmostEqual(throttle.wait(), 2.0)
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    """
+    Polls the condition until it holds or the timeout expires.
+
+    The in-memory SQLite test database locks tables written by another thread
+    instead of waiting, such reads are retried.
+    """
+
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        try:
+            if condition():
+                return True
+        except OperationalError:
+            pass
+        sleep(0.05)
+    return condition()
+
+
+@override_settings(VOTES_BUFFER_SECONDS=0.1, VOTES_BUFFER_SIZE=100)
+class VoteBufferTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="voter")
+        self.project = models.Project.objects.create(title="Project")
+        self.buffer = VoteBuffer()
+
+    def test_flushed_by_background_thread(self):
+        self.buffer.add(models.Rating, "value", self.user.id, self.project.id, 3)
+        self.assertEqual(models.Rating.objects.count(), 0)
+        self.assertTrue(wait_for(lambda: models.Rating.objects.exists()))
+
+    def test_coalesces_votes(self):
+        self.buffer.flusher.start = mock.Mock()
+        for value in (1, 2, 5):
+            self.buffer.add(
+                models.Rating, "value", self.user.id, self.project.id, value
+            )
+        self.buffer.flush()
+        self.assertEqual(
+            list(models.Rating.objects.values_list("value", flat=True)), [5]
+        )
+
+    def test_drops_votes_of_deleted_users(self):
+        self.buffer.flusher.start = mock.Mock()
+        gone = User.objects.create(username="gone")
+        self.buffer.add(models.Rating, "value", gone.id, self.project.id, 1)
+        self.buffer.add(models.Rating, "value", self.user.id, self.project.id, 4)
+        gone.delete()
+        self.buffer.flush()
+        self.assertEqual(
+            list(models.Rating.objects.values_list("user_id", "value")),
+            [(self.user.id, 4)],
+        )
+
+    def test_failed_batch_does_not_stop_others(self):
+        self.buffer.flusher.start = mock.Mock()
+        self.buffer.add(models.Rating, "value", self.user.id, self.project.id, 4)
+        self.buffer.add(models.Like, "is_like", self.user.id, self.project.id, True)
+        original = votes.upsert
+
+        def upsert(model, rows, update_field):
+            if model is models.Rating:
+                raise IntegrityError("broken")
+            original(model, rows, update_field)
+
+        with mock.patch("app.votes.upsert", upsert), self.assertLogs("app.votes"):
+            self.buffer.flush()
+        self.assertFalse(models.Rating.objects.exists())
+        self.assertTrue(models.Like.objects.exists())
+
+    def test_upsert_keeps_one_row_per_user_and_project(self):
+        votes.upsert(models.Rating, [(self.user.id, self.project.id, 2)], "value")
+        votes.upsert(models.Rating, [(self.user.id, self.project.id, 5)], "value")
+        self.assertEqual(
+            list(models.Rating.objects.values_list("value", flat=True)), [5]
+        )
+
+
+@override_settings(ACTIVITY_BUFFER_SECONDS=0.1, ACTIVITY_BUFFER_SIZE=100)
+class ActivityBufferTests(TransactionTestCase):
+    project_id = 10**9
+
+    def entry(self) -> models.Activity:
+        return models.Activity(
+            user_id=1,
+            project_id=self.project_id,
+            action=models.Activity.CREATED,
+            created_at=timezone.now(),
+        )
+
+    def logged(self) -> int:
+        return models.Activity.objects.filter(project_id=self.project_id).count()
+
+    def test_flushed_by_background_thread(self):
+        buffer = ActivityBuffer()
+        buffer.add(self.entry())
+        self.assertEqual(self.logged(), 0)
+        self.assertTrue(wait_for(lambda: self.logged() == 1))
+
+    def test_full_buffer_flushed_right_away(self):
+        buffer = ActivityBuffer()
+        with override_settings(ACTIVITY_BUFFER_SECONDS=60, ACTIVITY_BUFFER_SIZE=3):
+            for _ in range(3):
+                buffer.add(self.entry())
+            self.assertTrue(wait_for(lambda: self.logged() == 3, timeout=2))
+
+
+class ProjectEventsTests(TestCase):
+    def test_not_implemented_under_wsgi(self):
+        user = User.objects.create(username="listener")
+        project = models.Project.objects.create(title="Project")
+        self.client.force_login(user)
+        response = self.client.get(f"/api/projects/{project.id}/events")
+        self.assertEqual(response.status_code, 501)
+
+
+class ArchiveProjectsTests(TestCase):
+    def deactivate(self, project: models.Project, days: int) -> None:
+        models.Project.all_objects.filter(id=project.id).update(
+            is_active=False, updated_at=timezone.now() - timedelta(days=days)
+        )
+
+    def test_inactive_projects_hidden_by_default(self):
+        active = models.Project.objects.create(title="Active")
+        inactive = models.Project.objects.create(title="Inactive")
+        self.deactivate(inactive, days=0)
+        self.assertEqual(list(models.Project.objects.all()), [active])
+        self.assertEqual(models.Project.all_objects.count(), 2)
+
+    def test_moves_old_inactive_projects(self):
+        user = User.objects.create(username="author")
+        tag = models.Tag.objects.create(name="Python")
+        active = models.Project.objects.create(title="Active")
+        recent = models.Project.objects.create(title="Recent")
+        old = models.Project.objects.create(title="Old")
+        old.authors.add(user)
+        old.tags.add(tag)
+        comment = models.Comment.objects.create(project=old, user=user, text="Hi")
+        self.deactivate(recent, days=10)
+        self.deactivate(old, days=400)
+
+        call_command("archive_projects", "--dry-run", stdout=StringIO())
+        self.assertFalse(models.ArchivedProject.objects.exists())
+
+        call_command("archive_projects", "--batch-size=1", stdout=StringIO())
+        archived = models.ArchivedProject.objects.get()
+        self.assertEqual(archived.id, old.id)
+        self.assertEqual((archived.authors, archived.tags), ([user.id], [tag.id]))
+        self.assertEqual(models.ArchivedComment.objects.get().id, comment.id)
+        self.assertEqual(
+            set(models.Project.all_objects.values_list("id", flat=True)),
+            {active.id, recent.id},
+        )
+        self.assertFalse(models.Comment.objects.exists())
+
+    def test_likes_keep_creation_date(self):
+        user = User.objects.create(username="liker")
+        project = models.Project.objects.create(title="Project")
+        like = models.Like.objects.create(user=user, project=project, is_like=True)
+        self.deactivate(project, days=400)
+        call_command("archive_projects", stdout=StringIO())
+        archived = models.ArchivedLike.objects.get(id=like.id)
+        self.assertEqual(archived.created_at, like.created_at)
+        self.assertFalse(models.Like.objects.filter(id=like.id).exists())
+
+
+@override_settings(COMMENT_MAX_BODY_SIZE=1024)
+class CommentPostTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="commenter")
+        self.project = models.Project.objects.create(title="Project")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/projects/{self.project.id}/comments"
+
+    def test_body_without_length_rejected(self):
+        response = self.client.post(
+            self.url, {"text": "Hello"}, format="multipart", CONTENT_LENGTH=""
+        )
+        self.assertEqual(response.status_code, 411)
+        self.assertFalse(models.Comment.objects.exists())
+
+    def test_large_body_rejected(self):
+        response = self.client.post(self.url, {"text": "x" * 2000}, format="multipart")
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(models.Comment.objects.exists())
+
+    def test_large_body_not_read(self):
+        client = self.client_class()
+        client.force_login(self.user)
+        with mock.patch.object(
+            WSGIRequest, "_load_post_and_files", autospec=True
+        ) as load:
+            response = client.post(self.url, {"text": "x" * 2000})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(
+            response.json(), {"error": "Request body must be at most 1024 bytes."}
+        )
+        load.assert_not_called()
+
+    def test_idempotent_replay(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "key-1"}
+        first = self.client.post(self.url, {"text": "Hello"}, **headers)
+        second = self.client.post(self.url, {"text": "Hello"}, **headers)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(models.Comment.objects.count(), 1)
+
+    def test_idempotency_key_reused_for_other_body(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "key-2"}
+        self.client.post(self.url, {"text": "Hello"}, **headers)
+        response = self.client.post(self.url, {"text": "Other"}, **headers)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(models.Comment.objects.count(), 1)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="author")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, data: dict, key: str = "key-1"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/projects", data, format="multipart", HTTP_IDEMPOTENCY_KEY=key
+            )
+
+    def test_replay_returns_stored_response(self):
+        first = self.post({"title": "Project"})
+        second = self.post({"title": "Project"})
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual((second.status_code, second.json()), (201, first.json()))
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(models.Project.objects.count(), 1)
+
+    def test_key_reused_for_other_body(self):
+        self.post({"title": "Project"})
+        response = self.post({"title": "Other"})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(models.Project.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        self.post({"title": "Project"})
+        self.client.force_authenticate(User.objects.create(username="other"))
+        response = self.post({"title": "Project"})
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(models.Project.objects.count(), 2)
+
+    def test_expired_key_runs_again(self):
+        self.post({"title": "Project"})
+        models.IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        with override_settings(IDEMPOTENCY_KEY_SECONDS=60):
+            self.post({"title": "Project"})
+        self.assertEqual(models.Project.objects.count(), 2)
+
+    def test_failed_response_not_stored(self):
+        response = self.post({"title": ""})
+        self.assertGreaterEqual(response.status_code, 400)
+        self.assertFalse(models.IdempotencyKey.objects.exists())
+        self.assertEqual(self.post({"title": "Project"}).status_code, 201)
+
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="threads")
+        self.project = models.Project.objects.create(title="Project")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/projects/{self.project.id}/comments"
+
+    def post(self, text: str, parent: dict | None = None) -> dict:
+        data = {"text": text}
+        if parent:
+            data["parent"] = parent["id"]
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["data"]
+
+    def texts(self, response) -> list[str]:
+        self.assertEqual(response.status_code, 200, response.content)
+        return [comment["text"] for comment in response.json()["data"]]
+
+    def test_threads_depth_first_newest_first(self):
+        a = self.post("A")
+        b = self.post("B")
+        a1 = self.post("A1", a)
+        self.post("A2", a)
+        self.post("A11", a1)
+        self.post("B1", b)
+        first = self.client.get(self.url, {"limit": 1})
+        self.assertEqual(self.texts(first), ["B", "B1"])
+        second = self.client.get(self.url, {"limit": 1, "before": first.json()["next"]})
+        self.assertEqual(self.texts(second), ["A", "A1", "A11", "A2"])
+
+    def test_subtree_pages(self):
+        a = self.post("A")
+        a1 = self.post("A1", a)
+        self.post("A11", a1)
+        self.post("A2", a)
+        url = f"{self.url}/{a['id']}/thread"
+        first = self.client.get(url, {"limit": 2})
+        self.assertEqual(self.texts(first), ["A", "A1"])
+        second = self.client.get(url, {"after": first.json()["next"]})
+        self.assertEqual(self.texts(second), ["A11", "A2"])
+
+    def test_comments_created_outside_the_view_are_threaded(self):
+        root = models.Comment.objects.create(
+            user=self.user, project=self.project, text="Root"
+        )
+        reply = models.Comment.objects.create(
+            user=self.user, project=self.project, parent=root, text="Reply"
+        )
+        self.assertEqual(reply.depth, 1)
+        self.assertTrue(reply.path.startswith(root.path))
+        self.assertEqual(self.texts(self.client.get(self.url)), ["Root", "Reply"])
+
+    def test_delete_removes_replies(self):
+        a = self.post("A")
+        a1 = self.post("A1", a)
+        self.post("A11", a1)
+        b = self.post("B")
+        models.Comment.objects.get(id=a1["id"]).delete()
+        self.assertEqual(
+            set(models.Comment.objects.values_list("text", flat=True)), {"A", "B"}
+        )
+        models.Comment.objects.get(id=a["id"]).delete()
+        self.assertEqual(
+            list(models.Comment.objects.values_list("id", flat=True)), [b["id"]]
+        )
+
+    def test_depth_limit(self):
+        parent = self.post("Root")
+        with override_settings(COMMENT_MAX_DEPTH=1):
+            parent = self.post("Reply", parent)
+            response = self.client.post(
+                self.url, {"text": "Too deep", "parent": parent["id"]}
+            )
+        self.assertEqual(response.status_code, 400)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="reader")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index in range(3):
+            models.Project.objects.create(title=f"Project {index}")
+
+    def test_limit_clamped_to_one(self):
+        for limit in (0, -5):
+            response = self.client.get("/api/projects/cards", {"limit": limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["data"]), 1)
+            self.assertIsNotNone(response.json()["next"])
+
+    def test_cards_pages(self):
+        first = self.client.get("/api/projects/cards", {"limit": 2}).json()
+        second = self.client.get(
+            "/api/projects/cards", {"limit": 2, "before": first["next"]}
+        ).json()
+        titles = [card["title"] for card in first["data"] + second["data"]]
+        self.assertEqual(titles, ["Project 2", "Project 1", "Project 0"])
+        self.assertIsNone(second["next"])
+
+    def test_tied_timestamps(self):
+        moment = timezone.now()
+        models.Project.objects.update(created_at=moment)
+        ids = sorted(models.Project.objects.values_list("id", flat=True), reverse=True)
+        first = self.client.get("/api/projects/cards", {"limit": 2}).json()
+        second = self.client.get(
+            "/api/projects/cards", {"limit": 2, "before": first["next"]}
+        ).json()
+        self.assertEqual([card["id"] for card in first["data"] + second["data"]], ids)
+
+    def test_tied_threads(self):
+        project = models.Project.objects.first()
+        url = f"/api/projects/{project.id}/comments"
+        for text in ("A", "B", "C"):
+            self.client.post(url, {"text": text})
+        models.Comment.objects.update(created_at=project.created_at)
+        first = self.client.get(url, {"limit": 2}).json()
+        second = self.client.get(url, {"limit": 2, "before": first["next"]}).json()
+        self.assertEqual(
+            [comment["text"] for comment in first["data"] + second["data"]],
+            ["C", "B", "A"],
+        )
+
+    def test_tied_feed(self):
+        moment = timezone.now()
+        models.FeedItem.objects.bulk_create(
+            [
+                models.FeedItem(user=self.user, project=project, created_at=moment)
+                for project in models.Project.objects.all()
+            ]
+        )
+        ids = sorted(models.Project.objects.values_list("id", flat=True), reverse=True)
+        first = self.client.get("/api/feed", {"limit": 2}).json()
+        second = self.client.get(
+            "/api/feed", {"limit": 2, "before": first["next"]}
+        ).json()
+        self.assertEqual(
+            [project["id"] for project in first["data"] + second["data"]], ids
+        )
+
+    def test_invalid_parameters(self):
+        for params in ({"limit": "many"}, {"before": "yesterday"}):
+            response = self.client.get("/api/projects/cards", params)
+            self.assertEqual(response.status_code, 400)
+            self.assertNotIn("list index", response.json()["error"])
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0)
+class CompressionTests(TestCase):
+    def test_json_compressed(self):
+        models.Project.objects.create(title="Project")
+        response = self.client.get(
+            "/api/projects/cards",
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    @override_settings(
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+    )
+    def test_html_not_compressed(self):
+        response = self.client.get("/admin/login/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+)
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin")
+        self.client.force_login(self.admin)
+        self.project = models.Project.objects.create(title="Project")
+
+    def rate(self, count: int) -> None:
+        offset = User.objects.count()
+        names = [f"rater-{offset + n}" for n in range(count)]
+        User.objects.bulk_create(User(username=name) for name in names)
+        models.Rating.objects.bulk_create(
+            models.Rating(user=user, project=self.project, value=n % 5 + 1)
+            for n, user in enumerate(User.objects.filter(username__in=names))
+        )
+
+    def changelist(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_queries_do_not_grow_with_rows(self):
+        for url in ("/admin/app/rating/", "/admin/app/rating/?value=3"):
+            self.rate(2)
+            few = self.changelist(url)
+            self.rate(20)
+            self.assertEqual(self.changelist(url), few)
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=0)
+    def test_estimated_count_of_unfiltered_tables(self):
+        self.rate(3)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE app_rating")
+        self.rate(1)
+        estimated = EstimatedCountPaginator(models.Rating.objects.all(), 10)
+        filtered = EstimatedCountPaginator(models.Rating.objects.filter(value=1), 10)
+        self.assertEqual(estimated.count, 3 if connection.vendor == "postgresql" else 4)
+        self.assertEqual(filtered.count, 2)
+
+
+class VersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump(self):
+        self.assertEqual(versions.get("test:version"), 0)
+        versions.bump("test:version")
+        versions.bump("test:version")
+        self.assertEqual(versions.get("test:version"), 2)
+
+    def test_bump_after_eviction(self):
+        versions.get("test:version")
+        cache.delete("test:version")
+        versions.bump("test:version")
+        self.assertEqual(versions.get("test:version"), 1)
+
+    def test_cards_version_bumped_on_commit(self):
+        before = cards.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Project.objects.create(title="Project")
+            self.assertEqual(cards.version(), before)
+        self.assertEqual(cards.version(), before + 1)
+
+
+class ProjectLinksTests(TestCase):
+    def test_add_inserts_without_reading_links(self):
+        project = models.Project.objects.create(title="Project")
+        images = models.Image.objects.bulk_create(
+            [models.Image(url=f"images/{index}.jpg") for index in range(3)]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            project.images.add(*images)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]["sql"].startswith("INSERT"))
+
+
+@override_settings(PROJECTS_BATCH_LIMIT=5)
+class ProjectBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="batch")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.projects = [
+            models.Project.objects.create(title=f"Project {index}")
+            for index in range(3)
+        ]
+
+    def get(self, ids: str):
+        return self.client.get("/api/projects", {"ids": ids})
+
+    def test_projects_by_id(self):
+        first, second, _ = self.projects
+        response = self.get(f"{second.id},{first.id},{second.id},999999")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            [project["title"] for project in data["data"].values()],
+            ["Project 1", "Project 0"],
+        )
+        self.assertEqual(data["missing"], [999999])
+
+    def test_queries_do_not_grow_with_ids(self):
+        self.get(str(self.projects[0].id))
+        with CaptureQueriesContext(connection) as one:
+            self.get(str(self.projects[0].id))
+        with CaptureQueriesContext(connection) as many:
+            self.get(",".join(str(project.id) for project in self.projects))
+        self.assertEqual(len(many), len(one))
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.get("1,two").status_code, 400)
+        self.assertEqual(self.get("1,2,3,4,5,6").status_code, 400)
+
+
+class CommitCallbackTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="author")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_failed_fanout_does_not_fail_committed_project(self):
+        with mock.patch("app.feed.publish", side_effect=RuntimeError("down")):
+            response = self.client.post("/api/projects", {"title": "Project"})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(models.Project.objects.filter(title="Project").exists())
+
+    def test_failed_event_does_not_fail_committed_comment(self):
+        project = models.Project.objects.create(title="Project")
+        with mock.patch("app.events.broker.dispatch", side_effect=RuntimeError("down")):
+            response = self.client.post(
+                f"/api/projects/{project.id}/comments", {"text": "Hello"}
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(models.Comment.objects.count(), 1)
+
+
+class UserEmailTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="me", email="me@example.com")
+        self.other = User.objects.create(username="other", email="other@example.com")
+        self.client = APIClient()
+
+    def test_email_hidden_from_other_users(self):
+        self.client.force_authenticate(self.user)
+        other = self.client.get(f"/api/users/{self.other.id}/").json()["data"]
+        self.assertNotIn("email", other)
+        people = self.client.get("/api/people").json()["data"]
+        emails = {person["username"]: person.get("email") for person in people}
+        self.assertEqual(emails, {"me": "me@example.com", "other": None})
+
+    def test_email_shown_to_the_user_and_staff(self):
+        self.client.force_authenticate(self.user)
+        me = self.client.get(f"/api/users/{self.user.id}/").json()["data"]
+        self.assertEqual(me["email"], "me@example.com")
+        staff = User.objects.create(username="staff", is_staff=True)
+        self.client.force_authenticate(staff)
+        other = self.client.get(f"/api/users/{self.other.id}/").json()["data"]
+        self.assertEqual(other["email"], "other@example.com")
+
+
+class FeedReadTests(TestCase):
+    def setUp(self):
+        self.reader = User.objects.create(username="reader")
+        self.colleague = User.objects.create(username="colleague")
+        self.stranger = User.objects.create(username="stranger")
+        models.ExtendedGroup.objects.create(name="Team").users.add(
+            self.reader, self.colleague
+        )
+        self.python = models.Tag.objects.create(name="Python")
+        self.rust = models.Tag.objects.create(name="Rust")
+
+    def project(self, title: str, author: User, tag: models.Tag) -> models.Project:
+        project = models.Project.objects.create(title=title)
+        project.authors.add(author)
+        project.tags.add(tag)
+        return project
+
+    def publish_all(self) -> list[int]:
+        projects = [
+            self.project("Authored", self.reader, self.python),
+            self.project("Tag", self.stranger, self.python),
+            self.project("Group", self.colleague, self.rust),
+            self.project("Unrelated", self.stranger, self.rust),
+        ]
+        for project in projects:
+            feed.publish(project)
+        return [project.id for project in projects]
+
+    def feed(self) -> list[int]:
+        return [project_id for _, project_id in feed.read(self.reader, None, 10)]
+
+    def test_fan_out_on_write(self):
+        authored, tag, group, _ = self.publish_all()
+        self.assertEqual(self.feed(), [group, tag, authored])
+        reasons = dict(
+            models.FeedItem.objects.filter(user=self.reader).values_list(
+                "project_id", "reason"
+            )
+        )
+        self.assertEqual(
+            reasons,
+            {
+                authored: models.FeedItem.AUTHORED,
+                tag: models.FeedItem.TAG,
+                group: models.FeedItem.GROUP,
+            },
+        )
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_broadcasts_matched_on_read(self):
+        authored, tag, group, _ = self.publish_all()
+        self.assertEqual(self.feed(), [group, tag, authored])
+        self.assertEqual(
+            list(
+                models.FeedItem.objects.filter(user=self.reader).values_list(
+                    "project_id", flat=True
+                )
+            ),
+            [authored],
+        )
+
+
+class FeedUpdateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create(username="reader")
+        self.author = User.objects.create(username="author")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/projects", {"title": "Own", "tags": "python"})
+        own = models.Project.objects.get(title="Own")
+        own.authors.add(self.reader)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/projects", {"title": "New", "tags": "rust"})
+        self.project = models.Project.objects.get(title="New")
+        self.project.authors.add(self.author)
+
+    def feed(self) -> list[int]:
+        return [project_id for _, project_id in feed.read(self.reader, None, 10)]
+
+    def put_tags(self, tags: str) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"/api/projects/{self.project.id}/",
+                {"title": "New", "tags": tags},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_feeds_follow_tag_changes(self):
+        self.assertNotIn(self.project.id, self.feed())
+        self.put_tags("python")
+        self.assertIn(self.project.id, self.feed())
+        self.put_tags("rust")
+        self.assertNotIn(self.project.id, self.feed())
+
+
+class StaticFileTests(TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        for name in (
+            "app.0123456789ab.js",
+            "app.0123456789ab.js.br",
+            "app.0123456789ab.js.gz",
+        ):
+            (self.root / name).write_bytes(name.encode())
+        self.factory = RequestFactory()
+
+    def get(self, accept_encoding: str):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        with override_settings(STATIC_ROOT=self.root):
+            response = static_file(request, "app.0123456789ab.js")
+        response.close()
+        return response
+
+    def test_precompressed_variant(self):
+        response = self.get("gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_refused_encodings_are_not_sent(self):
+        self.assertEqual(self.get("br;q=0, gzip")["Content-Encoding"], "gzip")
+        self.assertFalse(self.get("br;q=0, gzip;q=0").has_header("Content-Encoding"))
+
+
+class ProfileTests(TestCase):
+    def test_created_once_for_new_users(self):
+        user = User.objects.create(username="member")
+        self.assertTrue(models.Profile.objects.filter(user=user).exists())
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(models.Profile.objects.filter(user=user).count(), 1)
+
+    def test_one_profile_per_user(self):
+        user = User.objects.create(username="member")
+        with self.assertRaises(IntegrityError):
+            models.Profile.objects.create(user=user)
+
+    def test_user_with_profile_in_one_query(self):
+        user = User.objects.create(username="member")
+        client = APIClient()
+        client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f"/api/users/{user.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["username"], "member")
+        self.assertEqual(len(queries), 1)
+
+
+class LookupTableTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = models.Category.objects.create(name="Science")
+
+    def test_rows_cached_per_process(self):
+        table = lookups.LookupTable(models.Category)
+        table.load()
+        with self.assertNumQueries(0):
+            self.assertEqual(table.name(self.category.id), "Science")
+            self.assertEqual(table.ids(["science", "unknown"]), [self.category.id])
+
+    @override_settings(LOOKUP_TABLES_CHECK_INTERVAL=0)
+    def test_changes_reach_other_workers_on_commit(self):
+        reader = lookups.LookupTable(models.Category)
+        reader.load()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = models.Category.objects.create(name="Art")
+            self.assertIsNone(reader.get_by_slug("art"))
+        self.assertEqual(reader.get_by_slug("art").id, category.id)
+
+
+class TagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_names_with_one_slug_share_a_tag(self):
+        ids = models.Tag.objects.get_or_create_many(["Python", " python ", "Django"])
+        self.assertEqual(set(ids), {"python", "django"})
+        self.assertEqual(models.Tag.objects.count(), 2)
+
+    def test_missing_tags_created_in_bulk(self):
+        models.Tag.objects.create(name="Python")
+        with CaptureQueriesContext(connection) as queries:
+            ids = lookups.tag_ids(["Python", "Django", "Rust", "Go"])
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(models.Tag.objects.count(), 4)
+        self.assertLessEqual(len(queries), 3)
+
+    def test_known_tags_resolved_without_queries(self):
+        models.Tag.objects.get_or_create_many(["Python", "Django"])
+        lookups.tags.invalidate()
+        lookups.tags.load()
+        with self.assertNumQueries(0):
+            ids = lookups.tag_ids(["Django", "python", "Django"])
+        self.assertEqual(
+            ids,
+            [models.Tag.objects.get(slug=slug).id for slug in ("django", "python")],
+        )
+
+
+@override_settings(REPLICA_DATABASES=["replica_1"])
+class ReplicaRoutingTests(TestCase):
+    class View:
+        @read_from_replica
+        def get(self, request):
+            return ReplicaRouter().db_for_read(models.Project)
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_safe_handlers_read_from_replica(self):
+        self.assertEqual(self.View().get(self.factory.get("/")), "replica_1")
+        self.assertEqual(ReplicaRouter().db_for_read(models.Project), "default")
+
+    def test_pinned_clients_read_from_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+        self.assertEqual(self.View().get(request), "default")
+
+    def test_writes_pin_the_client(self):
+        middleware = PrimaryPinMiddleware(lambda request: HttpResponse(status=201))
+        response = middleware(self.factory.post("/"))
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        response = middleware(self.factory.get("/"))
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas_reads_from_primary(self):
+        self.assertEqual(self.View().get(self.factory.get("/")), "default")
+
+
+class PartitionTests(TestCase):
+    def test_months(self):
+        self.assertEqual(partitions.add_months(date(2024, 11, 15), 2), date(2025, 1, 1))
+        self.assertEqual(
+            partitions.add_months(date(2024, 1, 31), -1), date(2023, 12, 1)
+        )
+        self.assertEqual(
+            partitions.partition_name("app_comment", date(2024, 5, 20)),
+            "app_comment_p2024_05",
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "Partitions need PostgreSQL.")
+    def test_comments_land_in_their_month(self):
+        self.assertTrue(partitions.is_partitioned("app_comment"))
+        month = date(2090, 3, 1)
+        self.assertTrue(partitions.create_partition("app_comment", month))
+        self.assertFalse(partitions.create_partition("app_comment", month))
+        user = User.objects.create(username="commenter")
+        project = models.Project.objects.create(title="Project")
+        comment = models.Comment.objects.create(project=project, user=user, text="Hi")
+        models.Comment.objects.filter(id=comment.id).update(
+            created_at=datetime(2090, 3, 31, 23, 59, tzinfo=dt_timezone.utc)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM app_comment WHERE id = %s",
+                [comment.id],
+            )
+            self.assertEqual(cursor.fetchone()[0], "app_comment_p2090_03")
+
+    def test_command_is_repeatable(self):
+        for _ in range(2):
+            call_command("create_partitions", stdout=StringIO())
+        if connection.vendor == "postgresql":
+            current = timezone.now().date()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT to_regclass(%s)",
+                    [partitions.partition_name("app_comment", current)],
+                )
+                self.assertIsNotNone(cursor.fetchone()[0])
+
+
+class ColdStartTests(TestCase):
+    def test_setup_does_not_import_drf(self):
+        process = profile_imports.Command().run(
+            "-c",
+            "import sys, django; django.setup(); print(sorted({"
+            "'rest_framework.compat', 'rest_framework.views', "
+            "'django.contrib.postgres.fields'} & set(sys.modules)))",
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertEqual(process.stdout.strip(), "[]")
+
+    def test_scheduled_commands_skip_checks(self):
+        for name in (
+            "archive_projects",
+            "build_feeds",
+            "build_rollups",
+            "clear_idempotency_keys",
+            "create_partitions",
+        ):
+            command = load_command_class("app", name)
+            self.assertEqual(command.requires_system_checks, [], name)
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        450 |   app.models\n"
+            "other output\n"
+        )
+        self.assertEqual(
+            profile_imports.Command().parse(output), [(120, 450, "app.models")]
+        )
+
+
+class ConfigTests(TestCase):
+    def load(self, **env: str) -> config.Config:
+        env = {"SECRET_KEY": "secret", "DJANGO_PROFILE": "production", **env}
+        with mock.patch.dict(environ, env, clear=True), mock.patch.object(
+            config, "ENV_DIR", Path("/nonexistent/.env")
+        ):
+            return config.load.__wrapped__()
+
+    def test_profile_defaults_and_overrides(self):
+        self.assertEqual(self.load().database_conn_max_age, 60)
+        self.assertEqual(self.load(DJANGO_PROFILE="test").events_backend, "local")
+        self.assertEqual(self.load(DATABASE_CONN_MAX_AGE="5").database_conn_max_age, 5)
+
+    def test_unknown_profile_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "DJANGO_PROFILE"):
+            self.load(DJANGO_PROFILE="staging")
+
+    def test_errors_reported_together(self):
+        with self.assertRaises(ImproperlyConfigured) as context:
+            self.load(SECRET_KEY="", PAGE_SIZE="many", DEBUG="maybe")
+        for env in ("SECRET_KEY", "PAGE_SIZE", "DEBUG"):
+            self.assertIn(f"{env}:", str(context.exception))
+
+    def test_local_events_need_one_worker(self):
+        self.assertEqual(
+            self.load(EVENTS_BACKEND="local", GUNICORN_WORKERS="1").gunicorn_workers, 1
+        )
+        with self.assertRaisesMessage(ImproperlyConfigured, "EVENTS_BACKEND"):
+            self.load(EVENTS_BACKEND="local", GUNICORN_WORKERS="4")
+
+    def test_max_page_size_below_page_size_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "MAX_PAGE_SIZE"):
+            self.load(PAGE_SIZE="100", MAX_PAGE_SIZE="50")
+        with self.assertRaisesMessage(ImproperlyConfigured, "MAX_PAGE_SIZE: invalid"):
+            self.load(PAGE_SIZE="100", MAX_PAGE_SIZE="many")
+
+
+class BuildRollupsTests(TestCase):
+    def setUp(self):
+        self.yesterday = timezone.localdate() - timedelta(days=1)
+        moment = analytics.day_start(self.yesterday) + timedelta(hours=12)
+        department = models.Department.objects.create(name="Research")
+        category = models.Category.objects.create(name="Science")
+        self.user = User.objects.create(username="member")
+        models.Profile.objects.filter(user=self.user).update(department=department)
+        self.project = models.Project.objects.create(title="Project", category=category)
+        models.Rating.objects.create(user=self.user, project=self.project, value=4)
+        models.Like.objects.create(user=self.user, project=self.project, is_like=True)
+        models.Comment.objects.create(project=self.project, user=self.user, text="Hi")
+        for model in (models.Project, models.Rating, models.Like, models.Comment):
+            model._base_manager.update(created_at=moment)
+
+    def rollups(self) -> list[tuple]:
+        return list(
+            models.DailyRollup.objects.order_by("metric").values_list(
+                "day", "metric", "key", "count"
+            )
+        )
+
+    def build(self, *args: str) -> str:
+        stdout = StringIO()
+        call_command("build_rollups", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_rebuild_after_archive_keeps_counts(self):
+        self.build()
+        built = self.rollups()
+        self.assertEqual(len(built), 5)
+        models.Project.all_objects.filter(id=self.project.id).update(
+            is_active=False, updated_at=timezone.now() - timedelta(days=400)
+        )
+        call_command("archive_projects", stdout=StringIO())
+        self.assertFalse(models.Rating.objects.exists())
+        self.build(f"--since={self.yesterday}")
+        self.assertEqual(self.rollups(), built)
+
+    def test_days_without_events_not_scanned_again(self):
+        models.Project.all_objects.update(
+            created_at=analytics.day_start(self.yesterday - timedelta(days=9))
+        )
+        self.build()
+        self.assertEqual(analytics.last_day(), self.yesterday)
+        self.assertNotIn("Rolled up", self.build())
@@ -0,0 +1,55 @@
+from django.db.models import Q
+from app import models
+
+WIDTH = models.Comment.PATH_WIDTH
+
+
+def make_path(parent_path: str, id: int) -> str:
+    """
+    Returns the materialized path of a comment.
+
+        Parameters:
+            parent_path (str): Path of the parent comment, empty for top-level comments.
+            id (int): Comment id.
+
+        Returns:
+            (str): Path of the parent followed by the zero-padded id.
+    """
+
+    return f"{parent_path}{id:0{WIDTH}d}"
+
+
+def root_path(path: str) -> str:
+    """
+    Returns the path of the top-level comment of the thread.
+
+        Parameters:
+            path (str): Path of any comment of the thread.
+
+        Returns:
+            (str): Path of the top-level comment.
+    """
+
+    return path[:WIDTH]
+
+
+def subtree(path: str) -> Q:
+    """
+    Returns a filter matching the comment with the given path and all of its replies.
+
+    Paths only hold digits, so the paths starting with the given one are exactly
+    those from it up to the next number of the same length. The filter is a
+    plain range that the (project, path) index serves under any collation,
+    unlike LIKE, which needs a "C" collation or a pattern operator class.
+
+        Parameters:
+            path (str): Path of the comment.
+
+        Returns:
+            (Q): Filter of the subtree.
+    """
+
+    end = str(int(path) + 1).zfill(len(path))
+    if len(end) > len(path):
+        return Q(path__gte=path)
+    return Q(path__gte=path, path__lt=end)
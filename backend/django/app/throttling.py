@@ -0,0 +1,187 @@
+from threading import Lock
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import SimpleRateThrottle
+
+BUCKET_SCRIPT = """
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", ARGV[3])
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+
+def take(
+    bucket: tuple[float, float] | None, capacity: int, refill: float, now: float
+) -> tuple[bool, tuple[float, float]]:
+    """
+    Refills the bucket for the time elapsed since its last update and takes a token.
+
+        Parameters:
+            bucket (tuple[float, float] or None): Tokens and time of the last update, None for a new bucket.
+            capacity (int): Maximum number of tokens.
+            refill (float): Tokens added per second.
+            now (float): Current time in seconds.
+
+        Returns:
+            (tuple[bool, tuple[float, float]]): Whether a token was taken and the new state of the bucket.
+    """
+
+    tokens, updated = bucket if bucket else (capacity, now)
+    tokens = min(capacity, tokens + max(0, now - updated) * refill)
+    if tokens >= 1:
+        return True, (tokens - 1, now)
+    return False, (tokens, now)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    A token bucket throttle shared by all workers through the cache.
+
+    The bucket of every user (or IP address for anonymous requests) and scope
+    holds as many tokens as the scope rate allows per period and refills
+    continuously. Its state is a single cache entry with the number of tokens
+    and the time of the last update: every request refills the bucket for the
+    elapsed time, takes a token if there is one and writes the state back with
+    a sliding expiry of one period, after which the bucket would be full again.
+
+    With the Redis cache the read-modify-write is a Lua script, atomic across
+    workers. Other cache backends update the entry under a process lock, which
+    is only atomic within a process. The local memory cache used without
+    REDIS_URL is per process, so every worker has its own buckets and the
+    effective rate is multiplied by the number of workers.
+
+    The scope comes from the view: get_throttle_scope can pick one from the
+    request, throttle_scopes maps HTTP methods to scopes, throttle_scope is
+    used for the other methods, "default" if none is set. Rates are taken from
+    REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]. Anonymous clients are identified
+    by their address, X-Forwarded-For is only trusted for the NUM_PROXIES
+    proxies in front of the application.
+
+        Methods:
+            get_scope(): Returns the scope of the request.
+            get_cache_key(): Returns the cache key of the bucket.
+            take_token(): Takes a token from the bucket in the cache.
+            allow_request(): Takes a token from the bucket if there is one.
+            wait(): Returns the number of seconds until the next token.
+    """
+
+    cache_format = "throttle_%(scope)s_%(ident)s"
+    lock = Lock()
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE]
+        self.wait_seconds = None
+
+    def get_scope(self, request, view) -> str:
+        """
+        Returns the scope of the request.
+
+            Parameters:
+                request (Request): The request object.
+                view (APIView): The view object.
+
+            Returns:
+                (str): Scope name.
+        """
+
+        if hasattr(view, "get_throttle_scope"):
+            scope = view.get_throttle_scope(request)
+            if scope:
+                return scope
+        scopes = getattr(view, "throttle_scopes", {})
+        return scopes.get(request.method, getattr(view, "throttle_scope", "default"))
+
+    def get_cache_key(self, request, view) -> str:
+        """
+        Returns the cache key of the bucket, per user or per IP address.
+
+            Parameters:
+                request (Request): The request object.
+                view (APIView): The view object.
+
+            Returns:
+                (str): Cache key.
+        """
+
+        if request.user and request.user.is_authenticated:
+            ident = f"user_{request.user.pk}"
+        else:
+            ident = f"ip_{self.get_ident(request)}"
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def take_token(
+        self, key: str, capacity: int, refill: float, period: int
+    ) -> tuple[bool, float]:
+        """
+        Takes a token from the bucket in the cache.
+
+            Parameters:
+                key (str): Cache key of the bucket.
+                capacity (int): Maximum number of tokens.
+                refill (float): Tokens added per second.
+                period (int): Expiry of the bucket in seconds.
+
+            Returns:
+                (tuple[bool, float]): Whether a token was taken and the number of tokens left.
+        """
+
+        now = self.timer()
+        if isinstance(self.cache, RedisCache):
+            key = self.cache.make_and_validate_key(key)
+            client = self.cache._cache.get_client(key, write=True)
+            allowed, tokens = client.eval(
+                BUCKET_SCRIPT, 1, key, capacity, repr(refill), repr(now), period
+            )
+            return bool(allowed), float(tokens)
+        with self.lock:
+            allowed, bucket = take(self.cache.get(key), capacity, refill, now)
+            self.cache.set(key, bucket, period)
+        return allowed, bucket[0]
+
+    def allow_request(self, request, view) -> bool:
+        """
+        Takes a token from the bucket if there is one.
+
+            Parameters:
+                request (Request): The request object.
+                view (APIView): The view object.
+
+            Returns:
+                (bool): True if the request is allowed.
+        """
+
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        capacity, period = self.parse_rate(self.rate)
+        refill = capacity / period
+        allowed, tokens = self.take_token(
+            self.get_cache_key(request, view), capacity, refill, period
+        )
+        if not allowed:
+            self.wait_seconds = (1 - tokens) / refill
+        return allowed
+
+    def wait(self) -> float | None:
+        """
+        Returns the number of seconds until the next token.
+
+            Returns:
+                (float or None): Seconds to wait.
+        """
+
+        return self.wait_seconds
@@ -9,7 +9,25 @@ urlpatterns = [
         include(
             [
                 path("projects", views.ProjectList.as_view()),
+                path("projects/cards", views.ProjectCardList.as_view()),
                 path("projects/<int:id>/", views.ProjectDetail.as_view()),
+                path("projects/<int:id>/comments", views.CommentList.as_view()),
+                path(
+                    "projects/<int:id>/comments/<int:comment_id>/thread",
+                    views.CommentThread.as_view(),
+                ),
+                path("projects/<int:id>/rating", views.ProjectRating.as_view()),
+                path("projects/<int:id>/like", views.ProjectLike.as_view()),
+                path("projects/<int:id>/events", views.project_events),
+                path(
+                    "projects/<int:id>/activity",
+                    views.ProjectActivityList.as_view(),
+                ),
+                path("feed", views.FeedList.as_view()),
+                path("users/<int:id>/", views.UserDetail.as_view()),
+                path("users/<int:id>/activity", views.UserActivityList.as_view()),
+                path("people", views.PeopleList.as_view()),
+                path("analytics", views.Analytics.as_view()),
             ]
         ),
     ),
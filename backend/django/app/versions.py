@@ -0,0 +1,34 @@
+from django.core.cache import cache
+
+
+def get(key: str) -> int:
+    """
+    Returns a version counter shared by all workers through the cache.
+
+        Parameters:
+            key (str): Cache key of the counter.
+
+        Returns:
+            (int): Current version, 0 for a new counter.
+    """
+
+    cache.add(key, 0, timeout=None)
+    return cache.get(key, 0)
+
+
+def bump(key: str) -> None:
+    """
+    Increments a version counter shared by all workers through the cache.
+
+    The counter never expires, if it is evicted between add and incr it is set
+    to 1 instead.
+
+        Parameters:
+            key (str): Cache key of the counter.
+    """
+
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
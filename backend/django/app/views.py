@@ -1,18 +1,57 @@
+import json
+import asyncio
+from datetime import date, timedelta
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework import status
 from django.contrib.auth.models import User
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render
-from app import models, serializers
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Q
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import json_script
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from app import (
+    models,
+    serializers,
+    lookups,
+    votes,
+    feed,
+    events,
+    activity,
+    analytics,
+    cards,
+    threads,
+)
+from app.pagination import (
+    StandardPagination,
+    before_keyset,
+    get_cursor,
+    get_limit,
+    get_next,
+    make_keyset,
+    parse_id,
+)
+from app.routers import read_from_replica
+from app.idempotency import idempotent
+from app.limits import max_body_size
 
 
 def index(request: HttpRequest) -> HttpResponse:
     """
-    HTML rendering.
+    HTML rendering with the first page of project cards embedded as JSON.
+
+    The page does not depend on the user, so it is rendered once per version of
+    the project cards and served from the cache for INDEX_CACHE_SECONDS. The
+    cards are in a script element with the id "initial-data", in the format of
+    ProjectCardList.get, so the first paint needs no API request.
 
         Parameters:
             request (HttpRequest): The request object.
@@ -22,7 +61,24 @@ def index(request: HttpRequest) -> HttpResponse:
     """
 
     try:
-        return render(request, "index.html")
+        key = f"index:{cards.version()}"
+        content = cache.get(key)
+        if content is None:
+            projects = cards.read(None, settings.INDEX_CARDS)
+            serializer = serializers.ProjectCardSerializer(projects, many=True)
+            next = get_next(
+                projects,
+                settings.INDEX_CARDS,
+                lambda project: make_keyset(project["created_at"], project["id"]),
+            )
+            data = json_script({"data": serializer.data, "next": next}, "initial-data")
+            content = render_to_string("index.html")
+            if "</body>" in content:
+                content = content.replace("</body>", f"{data}</body>", 1)
+            else:
+                content += data
+            cache.set(key, content, settings.INDEX_CACHE_SECONDS)
+        return HttpResponse(content)
     except Exception as error:
         return HttpResponse(status=status.HTTP_404_NOT_FOUND)
 
@@ -51,6 +107,61 @@ def api(request: Request) -> Response:
         return Response(data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+async def project_events(request: HttpRequest, id: int) -> HttpResponse:
+    """
+    Server-sent events of the project, requires an ASGI server.
+
+    The stream never ends, under WSGI it would hold a worker for as long as the
+    client stays connected, so the view answers 501 Not Implemented unless the
+    project is served through settings.asgi (GUNICORN_APP) by an ASGI worker
+    class (GUNICORN_WORKER_CLASS). Streams "comment", "rating", "like" and "project" events as they are
+    published, a comment line every EVENTS_HEARTBEAT_SECONDS keeps idle
+    connections open, and a "resync" event tells clients that fell behind to
+    reload the project.
+
+        Parameters:
+            request (HttpRequest): The request object.
+            id (int): Project id.
+
+        Returns:
+            If successful:
+                (StreamingHttpResponse): Event stream with request status 200 OK.
+            If unsuccessful:
+                (HttpResponse): Request status 403 Forbidden, 404 Not Found or 501 Not Implemented.
+    """
+
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=status.HTTP_501_NOT_IMPLEMENTED)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+    if not await models.Project.objects.filter(id=id).aexists():
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+    events.start_listener()
+
+    async def stream():
+        subscriber = events.broker.subscribe(id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                data = json.dumps(event["data"], default=str)
+                yield f"event: {event['event']}\ndata: {data}\n\n"
+        finally:
+            events.broker.unsubscribe(id, subscriber)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class ProjectList(APIView):
     """
     Receive all projects or create a new project.
@@ -59,13 +170,14 @@ class ProjectList(APIView):
             Authenticated users only.
 
         Methods:
-            GET: Get a list of all projects.
+            GET: Get a list of all projects, or the projects with the given ids.
             POST: Create a new project.
 
         Parameters:
+            ids (str): Comma-separated list of project ids to fetch, up to PROJECTS_BATCH_LIMIT.
             authors (str): Comma-separated list of usernames.
             category (str): Category slug.
-            tags (str): Comma-separated list of tags slugs.
+            tags (str): Comma-separated list of tag names or slugs, missing tags are created.
             title (str): Project title.
             description (str): Project description.
             images (str): Comma-separated list of image URLs.
@@ -73,7 +185,7 @@ class ProjectList(APIView):
 
         Returns:
             If successful:
-                [GET] (Response): JSON object with request status 200 OK and list of projects.
+                [GET] (Response): JSON object with request status 200 OK and list of projects, or projects by id and missing ids.
                 [POST] (Response): JSON object with request status 201 Created and new project.
             If unsuccessful:
                 (Response): JSON object with request status 400 Bad Request and error message.
@@ -81,23 +193,78 @@ class ProjectList(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scopes = {"POST": "write"}
+
+    def get_throttle_scope(self, request: Request) -> str | None:
+        """
+        Returns the stricter "bulk" throttle scope for requests fetching projects by id.
+
+            Parameters:
+                request (Request): The request object.
 
+            Returns:
+                (str or None): Scope name, None for the scope of the method.
+        """
+
+        if request.method == "GET" and request.query_params.get("ids"):
+            return "bulk"
+        return None
+
+    def get_batch(self, ids: str) -> Response:
+        """
+        Get the projects with the given ids in one query plus one per many-to-many field.
+
+            Parameters:
+                ids (str): Comma-separated list of project ids.
+
+            Returns:
+                (Response): JSON object with request status 200 OK, projects indexed by id in the requested order and missing ids.
+        """
+
+        try:
+            ids = list(dict.fromkeys(int(id) for id in ids.split(",") if id.strip()))
+        except ValueError:
+            raise Exception("ids must be a comma-separated list of integers.")
+        if len(ids) > settings.PROJECTS_BATCH_LIMIT:
+            raise Exception(
+                f"At most {settings.PROJECTS_BATCH_LIMIT} projects can be fetched at once."
+            )
+        projects = models.Project.objects.prefetch_related(
+            "authors", "tags", "images", "files"
+        ).in_bulk(ids)
+        found = [projects[id] for id in ids if id in projects]
+        serializer = serializers.ProjectSerializer(found, many=True)
+        return Response(
+            data={
+                "data": {project["id"]: project for project in serializer.data},
+                "missing": [id for id in ids if id not in projects],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @read_from_replica
     def get(self, request: Request) -> Response:
         """
-        Get a list of all projects.
+        Get a list of all projects, or the projects with the given ids.
 
             Parameters:
                 request (Request): The request object.
+                ids (str): Comma-separated list of project ids to fetch.
 
             Returns:
                 If successful:
-                    (Response): JSON object with request status 200 OK and list of projects.
+                    (Response): JSON object with request status 200 OK and list of projects, or projects by id and missing ids.
                 If unsuccessful:
                     (Response): JSON object with request status 400 Bad Request and error message.
         """
 
         try:
-            projects = models.Project.objects.all()
+            ids = request.query_params.get("ids", None)
+            if ids:
+                return self.get_batch(ids)
+            projects = models.Project.objects.prefetch_related(
+                "authors", "tags", "images", "files"
+            )
             serializer = serializers.ProjectSerializer(projects, many=True)
             return Response(data={"data": serializer.data}, status=status.HTTP_200_OK)
         except Exception as error:
@@ -105,15 +272,18 @@ class ProjectList(APIView):
                 data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
             )
 
+    @idempotent
     def post(self, request: Request) -> Response:
         """
         Create a new project.
 
+        Retries sent with the same Idempotency-Key header get the stored response.
+
             Parameters:
                 request (Request): The request object.
                 authors (str): Comma-separated list of usernames.
                 category (str): Category slug.
-                tags (str): Comma-separated list of tags slugs.
+                tags (str): Comma-separated list of tag names or slugs, missing tags are created.
                 title (str): Project title.
                 description (str): Project description.
                 images (str): Comma-separated list of image URLs.
@@ -127,38 +297,46 @@ class ProjectList(APIView):
         """
 
         try:
-            title = request.POST.get("title", None)
-            if not title:
-                raise Exception("Title is required.")
-            description = request.POST.get("description", None)
-            category_slug = request.POST.get("category", None)
-            if category:
-                category = models.Category.objects.get(slug=category_slug)
-            project = models.Project.objects.create(
-                title=title,
-                description=description,
-                category=category,
-            )
-            authors = request.POST.get("authors", None)
-            if authors:
-                users = User.objects.filter(username__in=authors.split(","))
-                project.authors.set(users)
-            tag_slugs = request.POST.get("tags", None)
-            if tag_slugs:
-                tags = models.Tag.objects.filter(slug__in=tag_slugs.split(","))
-                project.tags.set(tags)
-            image_urls = request.POST.get("images", None)
-            if image_urls:
-                images = models.Image.objects.bulk_create(
-                    [models.Image(url=url) for url in image_urls.split(",")]
+            with transaction.atomic():
+                title = request.POST.get("title", None)
+                if not title:
+                    raise Exception("Title is required.")
+                description = request.POST.get("description", None)
+                category_slug = request.POST.get("category", None)
+                category = lookups.categories.get_by_slug(category_slug)
+                if category_slug and not category:
+                    raise Exception(f"Unknown category: {category_slug}.")
+                project = models.Project.objects.create(
+                    title=title,
+                    description=description,
+                    category=category,
                 )
-                project.images.set(images)
-            file_urls = request.POST.get("files", None)
-            if file_urls:
-                files = models.File.objects.bulk_create(
-                    [models.File(url=url) for url in file_urls.split(",")]
+                authors = request.POST.get("authors", None)
+                if authors:
+                    users = User.objects.filter(username__in=authors.split(","))
+                    project.authors.add(*users.values_list("id", flat=True))
+                tag_names = request.POST.get("tags", None)
+                if tag_names:
+                    project.tags.add(*lookups.tag_ids(tag_names.split(",")))
+                image_urls = request.POST.get("images", None)
+                if image_urls:
+                    images = models.Image.objects.bulk_create(
+                        [models.Image(url=url) for url in image_urls.split(",")]
+                    )
+                    project.images.add(*images)
+                file_urls = request.POST.get("files", None)
+                if file_urls:
+                    files = models.File.objects.bulk_create(
+                        [models.File(url=url) for url in file_urls.split(",")]
+                    )
+                    project.files.add(*files)
+                transaction.on_commit(lambda: feed.publish(project), robust=True)
+                activity.log(
+                    models.Activity.CREATED,
+                    request.user.id,
+                    project.id,
+                    {"title": title},
                 )
-                project.files.set(files)
             serializer = serializers.ProjectSerializer(project, many=False)
             return Response(
                 data={"data": serializer.data}, status=status.HTTP_201_CREATED
@@ -169,6 +347,69 @@ class ProjectList(APIView):
             )
 
 
+class ProjectCardList(APIView):
+    """
+    Receive the project cards of the home page.
+
+        Permissions:
+            Everyone.
+
+        Methods:
+            GET: Get a page of project cards, newest first.
+
+        Parameters:
+            before (str): Cursor from next of the previous page, only older projects are returned.
+            limit (int): Number of cards per page, up to 100.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK, list of project cards and cursor of the next page.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [AllowAny]
+
+    @read_from_replica
+    def get(self, request: Request) -> Response:
+        """
+        Get a page of project cards, newest first.
+
+        A card only holds the title, category, cover image and counters of an
+        active project, read with a single query, so the home page does not
+        download descriptions, authors, tags and files of every project.
+
+            Parameters:
+                request (Request): The request object.
+                before (str): Cursor from next of the previous page, only older projects are returned.
+                limit (int): Number of cards per page, up to 100.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK, list of project cards and cursor of the next page.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            before, limit = get_cursor(request, 20, 100)
+            projects = cards.read(before, limit)
+            serializer = serializers.ProjectCardSerializer(projects, many=True)
+            next = get_next(
+                projects,
+                limit,
+                lambda project: make_keyset(project["created_at"], project["id"]),
+            )
+            return Response(
+                data={"data": serializer.data, "next": next},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
 class ProjectDetail(APIView):
     """
     Receive the project, update it, or delete it.
@@ -185,7 +426,7 @@ class ProjectDetail(APIView):
             id (int): Project id.
             authors (str): Comma-separated list of usernames.
             category (str): Category slug.
-            tags (str): Comma-separated list of tags slugs.
+            tags (str): Comma-separated list of tag names or slugs, missing tags are created.
             title (str): Project title.
             description (str): Project description.
             images (str): Comma-separated list of image URLs.
@@ -201,23 +442,29 @@ class ProjectDetail(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scopes = {"PUT": "write", "DELETE": "write"}
 
-    def get_project(self, id: int) -> models.Project:
+    def get_project(self, id: int, lock: bool = False) -> models.Project:
         """
         Get the project.
 
             Parameters:
                 id (int): Project id.
+                lock (bool): Lock the project row until the end of the transaction.
 
             Returns:
                 (models.Project): Project object.
         """
 
         try:
-            return models.Project.objects.get(id=id)
+            projects = models.Project.objects
+            if lock:
+                projects = projects.select_for_update(no_key=True)
+            return projects.get(id=id)
         except Exception as error:
             raise models.Project.DoesNotExist()
 
+    @read_from_replica
     def get(self, request: Request, id: int) -> Response:
         """
         Get the project.
@@ -246,12 +493,15 @@ class ProjectDetail(APIView):
         """
         Update the project.
 
+        Changing the tags publishes the project again, so the feeds follow its
+        new audience once the transaction commits.
+
             Parameters:
                 request (Request): The request object.
                 id (int): Project id.
                 authors (str): Comma-separated list of usernames.
                 category (str): Category slug.
-                tags (str): Comma-separated list of tags slugs.
+                tags (str): Comma-separated list of tag names or slugs, missing tags are created.
                 title (str): Project title.
                 description (str): Project description.
                 images (str): Comma-separated list of image URLs.
@@ -265,25 +515,37 @@ class ProjectDetail(APIView):
         """
 
         try:
-            project = self.get_project(id)
-            title = request.POST.get("title", None)
-            if title and project.title != title:
-                project.title = title
-            description = request.POST.get("description", None)
-            if project.description != description:
-                project.description = description
-            category_slug = request.POST.get("category", None)
-            if category:
-                category = models.Category.objects.get(slug=category_slug)
-            if project.category != category:
-                project.category = category
-            tag_slugs = request.POST.get("tags", None)
-            if tag_slugs:
-                tags = models.Tag.objects.filter(slug__in=tag_slugs.split(","))
-            if project.tags != tags:
-                project.tags = tags
-            project.save()
+            with transaction.atomic():
+                project = self.get_project(id, lock=True)
+                changes = {}
+                title = request.POST.get("title", None)
+                if title and project.title != title:
+                    changes["title"] = [project.title, title]
+                    project.title = title
+                description = request.POST.get("description", None)
+                if project.description != description:
+                    changes["description"] = [project.description, description]
+                    project.description = description
+                category_slug = request.POST.get("category", None)
+                if category_slug:
+                    category = lookups.categories.get_by_slug(category_slug)
+                    if not category:
+                        raise Exception(f"Unknown category: {category_slug}.")
+                    if project.category_id != category.id:
+                        changes["category"] = [project.category_id, category.id]
+                    project.category = category
+                project.save()
+                tag_names = request.POST.get("tags", None)
+                if tag_names:
+                    tag_ids = lookups.tag_ids(tag_names.split(","))
+                    project.tags.set(tag_ids)
+                    changes["tags"] = tag_ids
+                    transaction.on_commit(lambda: feed.publish(project), robust=True)
+                activity.log(
+                    models.Activity.UPDATED, request.user.id, project.id, changes
+                )
             serializer = serializers.ProjectSerializer(project, many=False)
+            events.publish(project.id, "project", serializer.data)
             return Response(data={"data": serializer.data}, status=status.HTTP_200_OK)
         except Exception as error:
             return Response(
@@ -306,9 +568,13 @@ class ProjectDetail(APIView):
         """
 
         try:
-            project = self.get_project(id)
-            project.is_active = False
-            project.save()
+            updated = models.Project.objects.filter(id=id).update(
+                is_active=False, updated_at=timezone.now()
+            )
+            if not updated:
+                raise models.Project.DoesNotExist()
+            cards.changed()
+            activity.log(models.Activity.DELETED, request.user.id, id)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Exception as error:
             return Response(
@@ -318,34 +584,34 @@ class ProjectDetail(APIView):
 
 class CommentList(APIView):
     """
-    Receive all comments or create a new comment.
+    Receive the comment threads of the project or create a new comment.
 
         Permissions:
             Authenticated users only.
 
         Methods:
-            GET: Get a list of all comments.
-            POST: Create a new comment.
+            GET: Get a page of the threads of the project, newest first.
+            POST: Create a new comment or reply.
 
         Parameters:
-            authors (str): Comma-separated list of usernames.
-            category (str): Category slug.
-            tags (str): Comma-separated list of tags slugs.
-            title (str): Project title.
-            description (str): Project description.
+            before (str): Cursor from next of the previous page, only older threads are returned.
+            limit (int): Number of threads per page, up to 100.
+            text (str): Comment text.
+            parent (int): Id of the comment to reply to.
             images (str): Comma-separated list of image URLs.
             files (str): Comma-separated list of file URLs.
 
         Returns:
             If successful:
-                [GET] (Response): JSON object with request status 200 OK and list of projects.
-                [POST] (Response): JSON object with request status 201 Created and new project.
+                [GET] (Response): JSON object with request status 200 OK, list of comments and cursor of the next page.
+                [POST] (Response): JSON object with request status 201 Created and new comment.
             If unsuccessful:
                 (Response): JSON object with request status 400 Bad Request and error message.
 
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scopes = {"POST": "write"}
 
     def get_project(self, id: int) -> models.Project:
         """
@@ -363,39 +629,181 @@ class CommentList(APIView):
         except Exception as error:
             raise models.Project.DoesNotExist()
 
+    @read_from_replica
     def get(self, request: Request, id: int) -> Response:
         """
-        Get a list of all comments.
+        Get a page of the threads of the project, newest first.
+
+        A page holds up to limit top-level comments, each followed by all of
+        its replies in depth-first order, read with one query of the subtree
+        ranges of the page. Comments are never older than their project and
+        replies never older than their thread, so creation dates bound both
+        scans and PostgreSQL skips the monthly partitions outside of them.
 
             Parameters:
                 request (Request): The request object.
                 id (int): Project id.
+                before (str): Cursor from next of the previous page, only older threads are returned.
+                limit (int): Number of threads per page, up to 100.
 
             Returns:
                 If successful:
-                    (Response): JSON object with request status 200 OK and list of comments.
+                    (Response): JSON object with request status 200 OK, list of comments and cursor of the next page.
                 If unsuccessful:
                     (Response): JSON object with request status 400 Bad Request and error message.
         """
 
         try:
             project = self.get_project(id)
-            comments = models.Comment.objects.filter(project=project)
+            roots = models.Comment.objects.filter(
+                project=project, depth=0, created_at__gte=project.created_at
+            )
+            before, limit = get_cursor(request, 50, 100)
+            if before:
+                roots = roots.filter(before_keyset(before))
+            roots = list(
+                roots.order_by("-created_at", "-id").values_list(
+                    "path", "created_at", "id"
+                )[:limit]
+            )
+            comments = []
+            if roots:
+                ranges = Q()
+                for path, _, _ in roots:
+                    ranges |= threads.subtree(path)
+                order = {path: index for index, (path, _, _) in enumerate(roots)}
+                comments = sorted(
+                    models.Comment.objects.filter(
+                        ranges,
+                        project=project,
+                        created_at__gte=min(created_at for _, created_at, _ in roots),
+                    )
+                    .select_related("user")
+                    .prefetch_related("images", "files"),
+                    key=lambda comment: (
+                        order[threads.root_path(comment.path)],
+                        comment.path,
+                    ),
+                )
             serializer = serializers.CommentSerializer(comments, many=True)
-            return Response(data={"data": serializer.data}, status=status.HTTP_200_OK)
+            next = get_next(roots, limit, lambda root: make_keyset(root[1], root[2]))
+            return Response(
+                data={"data": serializer.data, "next": next},
+                status=status.HTTP_200_OK,
+            )
         except Exception as error:
             return Response(
                 data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
             )
 
+    def get_parent(
+        self, project: models.Project, request: Request
+    ) -> models.Comment | None:
+        """
+        Get the comment the new comment replies to.
+
+            Parameters:
+                project (models.Project): Project object.
+                request (Request): The request object.
+
+            Returns:
+                (models.Comment or None): Parent comment with its id, path and depth only, or None for a top-level comment.
+        """
+
+        parent_id = request.POST.get("parent", None)
+        if not parent_id:
+            return None
+        parent = (
+            models.Comment.objects.filter(
+                project=project, id=parent_id, created_at__gte=project.created_at
+            )
+            .only("id", "path", "depth")
+            .first()
+        )
+        if not parent:
+            raise Exception(f"Unknown parent comment: {parent_id}.")
+        if parent.depth >= settings.COMMENT_MAX_DEPTH:
+            raise Exception(
+                f"Replies can be nested at most {settings.COMMENT_MAX_DEPTH} levels deep."
+            )
+        return parent
+
+    def add_attachments(
+        self, comment: models.Comment, field: str, urls: list[str]
+    ) -> None:
+        """
+        Creates the images or files of a new comment and links them to it.
+
+        Uses one statement for the attachments and one for the through rows,
+        whatever their number, and caches the attachments on the comment, so
+        serializing it does not query them again.
+
+            Parameters:
+                comment (models.Comment): New comment.
+                field (str): Many-to-many field, "images" or "files".
+                urls (list[str]): Attachment URLs.
+        """
+
+        manager = getattr(comment, field)
+        model = manager.model
+        attachments = (
+            model.objects.bulk_create([model(url=url) for url in urls]) if urls else []
+        )
+        if attachments:
+            manager.through.objects.bulk_create(
+                [
+                    manager.through(
+                        **{
+                            f"{manager.source_field_name}_id": comment.id,
+                            f"{manager.target_field_name}_id": attachment.id,
+                        }
+                    )
+                    for attachment in attachments
+                ]
+            )
+        cached = model.objects.none()
+        cached._result_cache = attachments
+        cached._prefetch_done = True
+        comment._prefetched_objects_cache[field] = cached
+
+    def get_urls(self, request: Request, name: str) -> list[str]:
+        """
+        Returns the attachment URLs of the request, up to COMMENT_MAX_ATTACHMENTS.
+
+            Parameters:
+                request (Request): The request object.
+                name (str): Parameter name, "images" or "files".
+
+            Returns:
+                (list[str]): Attachment URLs.
+        """
+
+        urls = [url for url in request.POST.get(name, "").split(",") if url]
+        if len(urls) > settings.COMMENT_MAX_ATTACHMENTS:
+            raise Exception(
+                f"At most {settings.COMMENT_MAX_ATTACHMENTS} {name} can be attached."
+            )
+        return urls
+
+    @max_body_size("COMMENT_MAX_BODY_SIZE")
+    @idempotent
     def post(self, request: Request, id: int) -> Response:
         """
         Create a new comment.
 
+        Bodies without a Content-Length or over COMMENT_MAX_BODY_SIZE bytes are
+        rejected before they are parsed, texts over COMMENT_MAX_LENGTH characters and more than
+        COMMENT_MAX_ATTACHMENTS images or files before anything is written.
+        The write takes at most eight statements: the project and parent
+        lookups, the comment and its path, and the attachments and through rows
+        of images and files. Replies can be nested COMMENT_MAX_DEPTH levels deep.
+        Retries sent with the same Idempotency-Key header get the stored response.
+
             Parameters:
                 request (Request): The request object.
                 id (int): Project id.
                 text (str): Comment text.
+                parent (int): Id of the comment to reply to.
                 images (str): Comma-separated list of image URLs.
                 files (str): Comma-separated list of file URLs.
 
@@ -403,31 +811,40 @@ class CommentList(APIView):
                 If successful:
                     (Response): JSON object with request status 201 Created and new comment.
                 If unsuccessful:
-                    (Response): JSON object with request status 400 Bad Request and error message.
+                    (Response): JSON object with request status 400 Bad Request and error message, 411 Length Required or 413 Request Entity Too Large.
         """
 
         try:
-            user = request.user
-            project = self.get_project(id)
             text = request.POST.get("text", None)
             if not text:
                 raise Exception("Comment text is required.")
-            comment = models.Comment.objects.create(
-                user=user, project=project, text=text
-            )
-            image_urls = request.POST.get("images", None)
-            if image_urls:
-                images = models.Image.objects.bulk_create(
-                    [models.Image(url=url) for url in image_urls.split(",")]
+            if len(text) > settings.COMMENT_MAX_LENGTH:
+                raise Exception(
+                    f"Comment text must be at most {settings.COMMENT_MAX_LENGTH} characters."
+                )
+            image_urls = self.get_urls(request, "images")
+            file_urls = self.get_urls(request, "files")
+            with transaction.atomic():
+                user = request.user
+                project = self.get_project(id)
+                parent = self.get_parent(project, request)
+                comment = models.Comment.objects.create(
+                    user=user,
+                    project=project,
+                    parent=parent,
+                    text=text,
                 )
-                comment.images.set(images)
-            file_urls = request.POST.get("files", None)
-            if file_urls:
-                files = models.File.objects.bulk_create(
-                    [models.File(url=url) for url in file_urls.split(",")]
+                comment._prefetched_objects_cache = {}
+                self.add_attachments(comment, "images", image_urls)
+                self.add_attachments(comment, "files", file_urls)
+                serializer = serializers.CommentSerializer(comment, many=False)
+                events.publish(project.id, "comment", serializer.data)
+                activity.log(
+                    models.Activity.COMMENTED,
+                    user.id,
+                    project.id,
+                    {"comment": comment.id},
                 )
-                comment.files.set(files)
-            serializer = serializers.CommentSerializer(comment, many=False)
             return Response(
                 data={"data": serializer.data}, status=status.HTTP_201_CREATED
             )
@@ -435,3 +852,575 @@ class CommentList(APIView):
             return Response(
                 data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
             )
+
+
+class CommentThread(APIView):
+    """
+    Receive a comment with all of its replies.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            GET: Get a page of the subtree of the comment in depth-first order.
+
+        Parameters:
+            after (str): Cursor of the previous page.
+            limit (int): Number of comments per page, up to 500.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK, list of comments and cursor of the next page.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @read_from_replica
+    def get(self, request: Request, id: int, comment_id: int) -> Response:
+        """
+        Get a page of the subtree of the comment in depth-first order.
+
+        The subtree is one range of the (project, path) index, read in index
+        order, and the cursor is the path of the last comment of the page.
+
+            Parameters:
+                request (Request): The request object.
+                id (int): Project id.
+                comment_id (int): Comment id.
+                after (str): Cursor of the previous page.
+                limit (int): Number of comments per page, up to 500.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK, list of comments and cursor of the next page.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            comment = (
+                models.Comment.objects.filter(
+                    project__is_active=True, project_id=id, id=comment_id
+                )
+                .values("path", "created_at")
+                .first()
+            )
+            if not comment:
+                raise models.Comment.DoesNotExist()
+            comments = models.Comment.objects.filter(
+                threads.subtree(comment["path"]),
+                project_id=id,
+                created_at__gte=comment["created_at"],
+            )
+            after = request.query_params.get("after", None)
+            if after:
+                if not after.isdigit():
+                    raise Exception("after must be a cursor of this thread.")
+                comments = comments.filter(path__gt=after)
+            limit = get_limit(request, 100, 500)
+            comments = list(
+                comments.order_by("path")
+                .select_related("user")
+                .prefetch_related("images", "files")[:limit]
+            )
+            serializer = serializers.CommentSerializer(comments, many=True)
+            next = get_next(comments, limit, lambda comment: comment.path)
+            return Response(
+                data={"data": serializer.data, "next": next},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class ProjectRating(APIView):
+    """
+    Rate the project.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            PUT: Set the rating of the current user.
+
+        Parameters:
+            id (int): Project id.
+            value (int): Rating from 1 to 5.
+
+        Returns:
+            If successful:
+                [PUT] (Response): JSON object with request status 200 OK and rating, or 202 Accepted if votes are buffered.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "vote"
+
+    def put(self, request: Request, id: int) -> Response:
+        """
+        Set the rating of the current user with a single upsert.
+
+            Parameters:
+                request (Request): The request object.
+                id (int): Project id.
+                value (int): Rating from 1 to 5.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK and rating, or 202 Accepted if votes are buffered.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            value = int(request.POST.get("value", 0))
+            if not 1 <= value <= 5:
+                raise Exception("Rating must be from 1 to 5.")
+            if not models.Project.objects.filter(id=id).exists():
+                raise models.Project.DoesNotExist("Project not found.")
+            written = votes.vote(models.Rating, "value", request.user.id, id, value)
+            events.publish(id, "rating", {"user": request.user.id, "value": value})
+            activity.log(models.Activity.RATED, request.user.id, id, {"value": value})
+            return Response(
+                data={"data": {"project": id, "value": value}},
+                status=status.HTTP_200_OK if written else status.HTTP_202_ACCEPTED,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class ProjectLike(APIView):
+    """
+    Like or dislike the project.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            PUT: Set the like of the current user.
+
+        Parameters:
+            id (int): Project id.
+            is_like (str): "true" for a like, "false" for a dislike.
+
+        Returns:
+            If successful:
+                [PUT] (Response): JSON object with request status 200 OK and like, or 202 Accepted if votes are buffered.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "vote"
+
+    def put(self, request: Request, id: int) -> Response:
+        """
+        Set the like of the current user with a single upsert.
+
+            Parameters:
+                request (Request): The request object.
+                id (int): Project id.
+                is_like (str): "true" for a like, "false" for a dislike.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK and like, or 202 Accepted if votes are buffered.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            is_like = request.POST.get("is_like", "true").lower()
+            if is_like not in ("true", "false"):
+                raise Exception("is_like must be true or false.")
+            is_like = is_like == "true"
+            if not models.Project.objects.filter(id=id).exists():
+                raise models.Project.DoesNotExist("Project not found.")
+            written = votes.vote(models.Like, "is_like", request.user.id, id, is_like)
+            events.publish(id, "like", {"user": request.user.id, "is_like": is_like})
+            activity.log(
+                models.Activity.LIKED, request.user.id, id, {"is_like": is_like}
+            )
+            return Response(
+                data={"data": {"project": id, "is_like": is_like}},
+                status=status.HTTP_200_OK if written else status.HTTP_202_ACCEPTED,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class FeedList(APIView):
+    """
+    Receive the feed of the current user.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            GET: Get a page of projects relevant to the user, newest first.
+
+        Parameters:
+            before (str): Cursor from next of the previous page, only older projects are returned.
+            limit (int): Number of projects per page, up to 100.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK, list of projects and cursor of the next page.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @read_from_replica
+    def get(self, request: Request) -> Response:
+        """
+        Get a page of projects authored by the user, sharing tags with the user's projects or from members of the user's groups.
+
+            Parameters:
+                request (Request): The request object.
+                before (str): Cursor from next of the previous page, only older projects are returned.
+                limit (int): Number of projects per page, up to 100.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK, list of projects and cursor of the next page.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            before, limit = get_cursor(request, 20, 100)
+            rows = feed.read(request.user, before, limit)
+            projects = models.Project.objects.prefetch_related(
+                "authors", "tags", "images", "files"
+            ).in_bulk([project_id for _, project_id in rows])
+            serializer = serializers.ProjectSerializer(
+                [projects[id] for _, id in rows if id in projects], many=True
+            )
+            next = get_next(rows, limit, lambda row: make_keyset(*row))
+            return Response(
+                data={"data": serializer.data, "next": next},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class ActivityList(APIView):
+    """
+    Receive the activity log filtered by filter_field, newest first.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            GET: Get a page of the activity log.
+
+        Parameters:
+            id (int): Project or user id.
+            before (int): Activity id, only older activities are returned.
+            limit (int): Number of activities per page, up to 100.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK, list of activities and cursor of the next page.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+    filter_field = None
+
+    @read_from_replica
+    def get(self, request: Request, id: int) -> Response:
+        """
+        Get a page of the activity log, newest first.
+
+        Activities are written in batches by a background thread of every
+        worker, the latest ones may take about ACTIVITY_BUFFER_SECONDS to appear.
+
+            Parameters:
+                request (Request): The request object.
+                id (int): Project or user id.
+                before (int): Activity id, only older activities are returned.
+                limit (int): Number of activities per page, up to 100.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK, list of activities and cursor of the next page.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            activities = models.Activity.objects.filter(**{self.filter_field: id})
+            before, limit = get_cursor(request, 50, 100, parse_id)
+            if before:
+                activities = activities.filter(id__lt=before)
+            activities = list(activities.order_by("-id")[:limit])
+            serializer = serializers.ActivitySerializer(activities, many=True)
+            next = get_next(activities, limit, lambda activity: activity.id)
+            return Response(
+                data={"data": serializer.data, "next": next},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class ProjectActivityList(ActivityList):
+    """
+    Receive the activity log of the project, newest first.
+    """
+
+    filter_field = "project_id"
+
+
+class UserActivityList(ActivityList):
+    """
+    Receive the activity log of the user, newest first.
+    """
+
+    filter_field = "user_id"
+
+
+class Analytics(APIView):
+    """
+    Receive the analytics of a range of days, served from the daily rollups.
+
+        Permissions:
+            Staff users only.
+
+        Methods:
+            GET: Get the daily counts and totals of every metric.
+
+        Parameters:
+            from (str): ISO date of the first day, 30 days before to by default.
+            to (str): ISO date of the last day, yesterday by default.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK and days and totals of every metric.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get_day(self, request: Request, name: str, default: date) -> date:
+        """
+        Get a day from the query parameters.
+
+            Parameters:
+                request (Request): The request object.
+                name (str): Name of the query parameter.
+                default (date): Day to use if the parameter is missing.
+
+            Returns:
+                (date): The day.
+        """
+
+        value = request.query_params.get(name, None)
+        if not value:
+            return default
+        day = parse_date(value)
+        if not day:
+            raise Exception(f"{name} must be an ISO date.")
+        return day
+
+    @read_from_replica
+    def get(self, request: Request) -> Response:
+        """
+        Get the daily counts and totals of every metric.
+
+        Days are rolled up by the build_rollups command once they are over,
+        the current day is never included.
+
+            Parameters:
+                request (Request): The request object.
+                from (str): ISO date of the first day.
+                to (str): ISO date of the last day.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK and days and totals of every metric.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            end = self.get_day(request, "to", timezone.localdate() - timedelta(days=1))
+            start = self.get_day(request, "from", end - timedelta(days=29))
+            if start > end:
+                raise Exception("from must not be after to.")
+            if (end - start).days >= settings.ANALYTICS_MAX_DAYS:
+                raise Exception(
+                    f"At most {settings.ANALYTICS_MAX_DAYS} days can be fetched at once."
+                )
+            return Response(
+                data={
+                    "data": analytics.read(start, end),
+                    "from": start,
+                    "to": end,
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class UserDetail(APIView):
+    """
+    Receive the user with the profile.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            GET: Get the user.
+
+        Parameters:
+            id (int): User id.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK and user.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_user(self, id: int) -> User:
+        """
+        Get the user with the profile in one query.
+
+            Parameters:
+                id (int): User id.
+
+            Returns:
+                (User): User object.
+        """
+
+        try:
+            return User.objects.select_related("profile").get(id=id)
+        except Exception as error:
+            raise User.DoesNotExist()
+
+    def get(self, request: Request, id: int) -> Response:
+        """
+        Get the user.
+
+            Parameters:
+                request (Request): The request object.
+                id (int): User id.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK and user.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            user = self.get_user(id)
+            serializer = serializers.UserSerializer(
+                user, many=False, context={"request": request}
+            )
+            return Response(data={"data": serializer.data}, status=status.HTTP_200_OK)
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class PeopleList(APIView):
+    """
+    Receive the directory of people.
+
+        Permissions:
+            Authenticated users only.
+
+        Methods:
+            GET: Get a page of users with their profiles.
+
+        Parameters:
+            department (str): Department slug.
+            position (str): Position slug.
+            city (str): City slug.
+            page (int): Page number.
+            page_size (int): Number of users per page.
+
+        Returns:
+            If successful:
+                [GET] (Response): JSON object with request status 200 OK, page of users and pagination metadata.
+            If unsuccessful:
+                (Response): JSON object with request status 400 Bad Request and error message.
+    """
+
+    permission_classes = [IsAuthenticated]
+    filters = {
+        "department": lookups.departments,
+        "position": lookups.positions,
+        "city": lookups.cities,
+    }
+
+    def get(self, request: Request) -> Response:
+        """
+        Get a page of users with their profiles.
+
+        Filter slugs are resolved through the lookup tables, so the only queries
+        are the page count and the page of users joined with their profiles.
+
+            Parameters:
+                request (Request): The request object.
+                department (str): Department slug.
+                position (str): Position slug.
+                city (str): City slug.
+
+            Returns:
+                If successful:
+                    (Response): JSON object with request status 200 OK, page of users and pagination metadata.
+                If unsuccessful:
+                    (Response): JSON object with request status 400 Bad Request and error message.
+        """
+
+        try:
+            users = User.objects.filter(is_active=True).select_related("profile")
+            for name, table in self.filters.items():
+                slug = request.query_params.get(name, None)
+                if slug:
+                    row = table.get_by_slug(slug)
+                    if not row:
+                        raise Exception(f"Unknown {name}: {slug}.")
+                    users = users.filter(**{f"profile__{name}_id": row.id})
+            users = users.order_by("first_name", "last_name", "id")
+            paginator = StandardPagination()
+            page = paginator.paginate_queryset(users, request, view=self)
+            serializer = serializers.UserSerializer(
+                page, many=True, context={"request": request}
+            )
+            return Response(
+                data={"data": serializer.data, **paginator.get_meta()},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as error:
+            return Response(
+                data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
@@ -0,0 +1,149 @@
+import atexit
+import logging
+from threading import Lock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from app import models
+from app.buffers import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+
+def upsert(model, rows: list, update_field: str) -> None:
+    """
+    Inserts or updates votes with a single statement.
+
+    Relies on the unique (user, project) constraint of the model, the conflicting
+    row gets the new value instead of a second row.
+
+        Parameters:
+            model (Model): Rating or Like model.
+            rows (list[tuple[int, int, object]]): User id, project id and value of every vote.
+            update_field (str): Name of the value field.
+    """
+
+    if not rows:
+        return
+    model.objects.bulk_create(
+        [
+            model(user_id=user_id, project_id=project_id, **{update_field: value})
+            for user_id, project_id, value in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "project"],
+        update_fields=[update_field],
+    )
+
+
+class VoteBuffer:
+    """
+    An in-memory buffer that coalesces votes and writes them in batches.
+
+    Repeated votes of the same user on the same project collapse into the last
+    one. A background thread flushes the buffer with one upsert per model every
+    VOTES_BUFFER_SECONDS, and as soon as it holds VOTES_BUFFER_SIZE votes, so a
+    vote waits about VOTES_BUFFER_SECONDS at most. The buffer is also flushed
+    when the process exits, a killed process loses the votes of the last
+    interval.
+
+        Methods:
+            add(): Adds a vote to the buffer.
+            flush(): Writes all buffered votes to the database.
+    """
+
+    def __init__(self):
+        self._votes = {}
+        self._lock = Lock()
+        self.flusher = PeriodicFlusher(
+            self.flush, "VOTES_BUFFER_SECONDS", "vote-buffer"
+        )
+
+    def add(
+        self, model, update_field: str, user_id: int, project_id: int, value
+    ) -> None:
+        """
+        Adds a vote to the buffer, waking up the flush thread if the buffer is full.
+
+            Parameters:
+                model (Model): Rating or Like model.
+                update_field (str): Name of the value field.
+                user_id (int): User id.
+                project_id (int): Project id.
+                value (object): Value of the vote.
+        """
+
+        with self._lock:
+            self._votes[(model, update_field, user_id, project_id)] = value
+            full = len(self._votes) >= settings.VOTES_BUFFER_SIZE
+        if full:
+            self.flusher.wake()
+        else:
+            self.flusher.start()
+
+    def flush(self) -> None:
+        """
+        Writes all buffered votes to the database.
+
+        Votes of users or for projects deleted in the meantime are dropped.
+        Every batch is written in its own transaction, a failing batch is
+        logged and does not keep the others from being written.
+        """
+
+        with self._lock:
+            votes, self._votes = self._votes, {}
+        if not votes:
+            return
+        project_ids = {project_id for _, _, _, project_id in votes}
+        user_ids = {user_id for _, _, user_id, _ in votes}
+        existing_projects = set(
+            models.Project.all_objects.filter(id__in=project_ids).values_list(
+                "id", flat=True
+            )
+        )
+        existing_users = set(
+            User.objects.filter(id__in=user_ids).values_list("id", flat=True)
+        )
+        batches = {}
+        for (model, update_field, user_id, project_id), value in votes.items():
+            if project_id in existing_projects and user_id in existing_users:
+                batches.setdefault((model, update_field), []).append(
+                    (user_id, project_id, value)
+                )
+        for (model, update_field), rows in batches.items():
+            try:
+                with transaction.atomic():
+                    upsert(model, rows, update_field)
+            except Exception:
+                logger.exception(
+                    "Writing %d buffered %s votes failed.",
+                    len(rows),
+                    model._meta.model_name,
+                )
+
+
+buffer = VoteBuffer()
+
+atexit.register(buffer.flush)
+
+
+def vote(model, update_field: str, user_id: int, project_id: int, value) -> bool:
+    """
+    Saves a vote, directly or through the buffer depending on VOTES_BUFFERED.
+
+        Parameters:
+            model (Model): Rating or Like model.
+            update_field (str): Name of the value field.
+            user_id (int): User id.
+            project_id (int): Project id.
+            value (object): Value of the vote.
+
+        Returns:
+            (bool): True if the vote was written, False if it was buffered.
+    """
+
+    if settings.VOTES_BUFFERED:
+        buffer.add(model, update_field, user_id, project_id, value)
+        return False
+    upsert(model, [(user_id, project_id, value)], update_field)
+    return True
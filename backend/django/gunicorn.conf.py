@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration, used when gunicorn is started from this directory.
+
+The application is imported once in the master process (preload_app), with
+the URLconf, views and serializers, then the workers are forked from it. Workers
+boot without importing Django again and share the loaded modules copy-on-write.
+Code changes need a full restart, as reloading the workers keeps the old code.
+Worker settings come from the GUNICORN_* variables read by settings.config.
+"""
+
+import gc
+from settings.config import load
+
+project_config = load()
+
+wsgi_app = project_config.gunicorn_app
+
+worker_class = project_config.gunicorn_worker_class
+
+bind = project_config.gunicorn_bind
+
+workers = project_config.gunicorn_workers
+
+threads = project_config.gunicorn_threads
+
+timeout = project_config.gunicorn_timeout
+
+max_requests = project_config.gunicorn_max_requests
+
+max_requests_jitter = project_config.gunicorn_max_requests_jitter
+
+preload_app = True
+
+
+def when_ready(server):
+    """
+    Imports the rest of the project in the master process before the workers are forked.
+
+    Freezing the garbage collector keeps the loaded objects out of later
+    collections, which would otherwise touch and copy their memory pages in
+    every worker.
+    """
+
+    if not server.cfg.preload_app:
+        return
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """
+    Drops database connections inherited from the master process.
+    """
+
+    from django.db import connections
+
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    """
+    Writes the buffered votes and activities before the worker exits, e.g. when it is recycled after max_requests.
+    """
+
+    from app import activity, votes
+
+    votes.buffer.flush()
+    activity.buffer.flush()
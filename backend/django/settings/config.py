@@ -0,0 +1,290 @@
+"""
+Typed configuration of the project, parsed from the environment once per process.
+
+Every setting has a default, the profile selected by DJANGO_PROFILE
+("development", "production" or "test") can override it, and the environment
+variable of the setting overrides both. Without DJANGO_PROFILE the profile is
+"development" on the hosts listed in HOST_NAMES and "production" elsewhere.
+All variables are validated together, invalid ones are reported in a single
+ImproperlyConfigured error instead of failing on the first one, together with
+combinations of settings that cannot work.
+"""
+
+from dataclasses import dataclass, field, fields
+from functools import cache
+from os import cpu_count, environ
+from pathlib import Path
+from socket import gethostname
+from types import UnionType
+from typing import get_args, get_origin
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+ENV_DIR = BASE_DIR / ".env"
+
+PROFILES = {
+    "development": {
+        "DEBUG": "True",
+        "DATABASE_CONN_MAX_AGE": "0",
+        "STATIC_MAX_AGE": "0",
+        "INDEX_CACHE_SECONDS": "0",
+        "EVENTS_BACKEND": "local",
+        "GUNICORN_WORKERS": "1",
+    },
+    "production": {
+        "DEBUG": "False",
+        "DATABASE_CONN_MAX_AGE": "60",
+        "DATABASE_CONN_HEALTH_CHECKS": "True",
+    },
+    "test": {
+        "DEBUG": "False",
+        "VOTES_BUFFERED": "False",
+        "ACTIVITY_BUFFER_SIZE": "1",
+        "EVENTS_BACKEND": "local",
+        "GUNICORN_WORKERS": "1",
+    },
+}
+
+TRUE_VALUES = ("true", "1", "yes", "on")
+
+FALSE_VALUES = ("false", "0", "no", "off")
+
+
+def setting(
+    env: str,
+    default: str | None = None,
+    required: bool = False,
+    minimum: float | None = None,
+    maximum: float | None = None,
+    choices: tuple | None = None,
+):
+    """
+    Declares a field of Config read from an environment variable.
+
+        Parameters:
+            env (str): Name of the environment variable.
+            default (str or None): Raw default value, parsed like the variable.
+            required (bool): Whether a value must be set.
+            minimum (float or None): Smallest allowed number.
+            maximum (float or None): Largest allowed number.
+            choices (tuple or None): Allowed values.
+
+        Returns:
+            (Field): Dataclass field.
+    """
+
+    return field(
+        metadata={
+            "env": env,
+            "default": default,
+            "required": required,
+            "minimum": minimum,
+            "maximum": maximum,
+            "choices": choices,
+        }
+    )
+
+
+def parse(value: str, kind: type) -> object:
+    """
+    Converts a raw environment value to the type of the field.
+
+        Parameters:
+            value (str): Raw value.
+            kind (type): Field type, bool, int, float, str or tuple[str, ...].
+
+        Returns:
+            (object): Parsed value.
+    """
+
+    origin = get_origin(kind)
+    if origin is tuple:
+        return tuple(item.strip() for item in value.split(",") if item.strip())
+    if origin is UnionType:
+        kind = next(arg for arg in get_args(kind) if arg is not type(None))
+    if kind is bool:
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"expected one of {', '.join(TRUE_VALUES + FALSE_VALUES)}")
+    return kind(value)
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Settings of the project, grouped by the part of the project they tune.
+
+        Attributes:
+            profile (str): Selected profile.
+            debug (bool): Django DEBUG.
+            database_conn_max_age (int): Seconds a database connection is reused, 0 closes it after every request.
+            redis_url (str or None): Cache location, the local memory cache is used without it.
+            page_size (int): Default page size of paginated list endpoints.
+            num_proxies (int): Number of proxies in front of the application, only their X-Forwarded-For entries are trusted.
+            gunicorn_workers (int): Number of gunicorn worker processes.
+    """
+
+    profile: str
+    secret_key: str = setting("SECRET_KEY", required=True)
+    debug: bool = setting("DEBUG", "False")
+    allowed_hosts: tuple[str, ...] = setting("ALLOWED_HOSTS", "")
+    cors_allow_all_origins: bool = setting("CORS_ALLOW_ALL_ORIGINS", "False")
+    cors_allowed_origins: tuple[str, ...] = setting("CORS_ALLOWED_ORIGINS", "")
+
+    database_name: str | None = setting("DATABASE_NAME")
+    database_user: str | None = setting("DATABASE_USER")
+    database_password: str | None = setting("DATABASE_PASSWORD")
+    database_host: str | None = setting("DATABASE_HOST")
+    database_port: str | None = setting("DATABASE_PORT")
+    database_replica_hosts: tuple[str, ...] = setting("DATABASE_REPLICA_HOSTS", "")
+    database_conn_max_age: int = setting("DATABASE_CONN_MAX_AGE", "0", minimum=0)
+    database_conn_health_checks: bool = setting("DATABASE_CONN_HEALTH_CHECKS", "False")
+    replica_pin_seconds: int = setting("REPLICA_PIN_SECONDS", "5", minimum=0)
+
+    redis_url: str | None = setting("REDIS_URL")
+    redis_max_connections: int = setting("REDIS_MAX_CONNECTIONS", "0", minimum=0)
+    cache_timeout: int = setting("CACHE_TIMEOUT", "300", minimum=0)
+    lookup_tables_check_interval: int = setting(
+        "LOOKUP_TABLES_CHECK_INTERVAL", "5", minimum=0
+    )
+
+    page_size: int = setting("PAGE_SIZE", "50", minimum=1)
+    max_page_size: int = setting("MAX_PAGE_SIZE", "200", minimum=1)
+    index_cards: int = setting("INDEX_CARDS", "20", minimum=0)
+    index_cache_seconds: int = setting("INDEX_CACHE_SECONDS", "60", minimum=0)
+    projects_batch_limit: int = setting("PROJECTS_BATCH_LIMIT", "100", minimum=1)
+    feed_fanout_limit: int = setting("FEED_FANOUT_LIMIT", "1000", minimum=0)
+    analytics_max_days: int = setting("ANALYTICS_MAX_DAYS", "366", minimum=1)
+    comment_max_length: int = setting("COMMENT_MAX_LENGTH", "5000", minimum=1)
+    comment_max_attachments: int = setting("COMMENT_MAX_ATTACHMENTS", "10", minimum=0)
+    comment_max_body_size: int = setting("COMMENT_MAX_BODY_SIZE", "65536", minimum=1)
+    comment_max_depth: int = setting("COMMENT_MAX_DEPTH", "8", minimum=0, maximum=19)
+    estimated_count_threshold: int = setting(
+        "ESTIMATED_COUNT_THRESHOLD", "100000", minimum=0
+    )
+
+    votes_buffered: bool = setting("VOTES_BUFFERED", "False")
+    votes_buffer_size: int = setting("VOTES_BUFFER_SIZE", "500", minimum=1)
+    votes_buffer_seconds: float = setting("VOTES_BUFFER_SECONDS", "1", minimum=0)
+    activity_buffer_size: int = setting("ACTIVITY_BUFFER_SIZE", "200", minimum=1)
+    activity_buffer_seconds: float = setting("ACTIVITY_BUFFER_SECONDS", "1", minimum=0)
+    idempotency_key_seconds: int = setting(
+        "IDEMPOTENCY_KEY_SECONDS", "86400", minimum=1
+    )
+    partitions_ahead_months: int = setting("PARTITIONS_AHEAD_MONTHS", "3", minimum=0)
+
+    events_backend: str = setting(
+        "EVENTS_BACKEND", "postgres", choices=("local", "postgres")
+    )
+    events_queue_size: int = setting("EVENTS_QUEUE_SIZE", "100", minimum=1)
+    events_heartbeat_seconds: int = setting("EVENTS_HEARTBEAT_SECONDS", "15", minimum=1)
+
+    json_renderer: str = setting("JSON_RENDERER", "app.renderers.FastJSONRenderer")
+    throttle_rate_default: str = setting("THROTTLE_RATE_DEFAULT", "600/min")
+    throttle_rate_write: str = setting("THROTTLE_RATE_WRITE", "30/min")
+    throttle_rate_vote: str = setting("THROTTLE_RATE_VOTE", "120/min")
+    throttle_rate_bulk: str = setting("THROTTLE_RATE_BULK", "60/min")
+    num_proxies: int = setting("NUM_PROXIES", "0", minimum=0)
+    compression_min_size: int = setting("COMPRESSION_MIN_SIZE", "1024", minimum=0)
+    static_max_age: int = setting("STATIC_MAX_AGE", "300", minimum=0)
+    media_sendfile_header: str | None = setting("MEDIA_SENDFILE_HEADER")
+    media_sendfile_prefix: str = setting("MEDIA_SENDFILE_PREFIX", "/protected-media/")
+
+    gunicorn_app: str = setting("GUNICORN_APP", "settings.wsgi:application")
+    gunicorn_bind: str = setting("GUNICORN_BIND", "0.0.0.0:8000")
+    gunicorn_worker_class: str = setting("GUNICORN_WORKER_CLASS", "sync")
+    gunicorn_workers: int = setting(
+        "GUNICORN_WORKERS", str(2 * (cpu_count() or 1) + 1), minimum=1
+    )
+    gunicorn_threads: int = setting("GUNICORN_THREADS", "1", minimum=1)
+    gunicorn_timeout: int = setting("GUNICORN_TIMEOUT", "30", minimum=0)
+    gunicorn_max_requests: int = setting("GUNICORN_MAX_REQUESTS", "10000", minimum=0)
+    gunicorn_max_requests_jitter: int = setting(
+        "GUNICORN_MAX_REQUESTS_JITTER", "1000", minimum=0
+    )
+
+
+def get_profile() -> str:
+    """
+    Returns the profile from DJANGO_PROFILE, or from HOST_NAMES if it is not set.
+
+        Returns:
+            (str): Profile name.
+    """
+
+    profile = environ.get("DJANGO_PROFILE")
+    if profile:
+        return profile
+    host_names = parse(environ.get("HOST_NAMES", ""), tuple[str, ...])
+    return "development" if gethostname() in host_names else "production"
+
+
+@cache
+def load() -> Config:
+    """
+    Parses and validates the environment, once per process.
+
+    Variables from the .env file next to the project are loaded first, without
+    overriding the ones already set.
+
+        Returns:
+            (Config): The configuration.
+    """
+
+    load_dotenv(ENV_DIR)
+    profile = get_profile()
+    if profile not in PROFILES:
+        raise ImproperlyConfigured(
+            f"DJANGO_PROFILE: expected one of {', '.join(PROFILES)}, got {profile!r}."
+        )
+    defaults = PROFILES[profile]
+    values = {}
+    errors = []
+    for item in fields(Config):
+        if not item.metadata:
+            continue
+        env = item.metadata["env"]
+        raw = environ.get(env) or defaults.get(env, item.metadata["default"])
+        if raw is None:
+            if item.metadata["required"]:
+                errors.append(f"{env}: required.")
+            values[item.name] = None
+            continue
+        try:
+            value = parse(raw, item.type)
+        except ValueError as error:
+            errors.append(f"{env}: invalid value {raw!r}, {error}.")
+            continue
+        minimum = item.metadata["minimum"]
+        maximum = item.metadata["maximum"]
+        choices = item.metadata["choices"]
+        if minimum is not None and value < minimum:
+            errors.append(f"{env}: must be at least {minimum}, got {value}.")
+        elif maximum is not None and value > maximum:
+            errors.append(f"{env}: must be at most {maximum}, got {value}.")
+        elif choices is not None and value not in choices:
+            errors.append(f"{env}: expected one of {', '.join(choices)}.")
+        values[item.name] = value
+    if (
+        values.get("events_backend") == "local"
+        and values.get("gunicorn_workers", 1) > 1
+    ):
+        errors.append(
+            'EVENTS_BACKEND: "local" only reaches clients of the same process, '
+            'use "postgres" with more than one gunicorn worker.'
+        )
+    if (
+        values.keys() >= {"page_size", "max_page_size"}
+        and values["max_page_size"] < values["page_size"]
+    ):
+        errors.append(
+            f"MAX_PAGE_SIZE: must be at least PAGE_SIZE ({values['page_size']}), "
+            f"got {values['max_page_size']}."
+        )
+    if errors:
+        raise ImproperlyConfigured("Invalid environment:\n" + "\n".join(errors))
+    return Config(profile=profile, **values)
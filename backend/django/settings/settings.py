@@ -1,28 +1,22 @@
 from pathlib import Path
-from dotenv import load_dotenv
-from socket import gethostname
-from os import getenv
+from corsheaders.defaults import default_headers
+from settings.config import load
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-ENV_DIR = BASE_DIR / ".env"
+CONFIG = load()
 
-load_dotenv(ENV_DIR)
+SECRET_KEY = CONFIG.secret_key
 
-if not getenv("SECRET_KEY"):
-    raise Exception("ENV NOT FOUND!")
+DEBUG = CONFIG.debug
 
-SECRET_KEY = getenv("SECRET_KEY")
+ALLOWED_HOSTS = list(CONFIG.allowed_hosts)
 
-HOST_NAMES = getenv("HOST_NAMES", "").split(",")
+CORS_ALLOW_ALL_ORIGINS = CONFIG.cors_allow_all_origins
 
-DEBUG = gethostname() in HOST_NAMES
+CORS_ALLOWED_ORIGINS = list(CONFIG.cors_allowed_origins)
 
-ALLOWED_HOSTS = getenv("ALLOWED_HOSTS", "").split(",")
-
-CORS_ALLOW_ALL_ORIGINS = True if getenv("CORS_ALLOW_ALL_ORIGINS") == "True" else False
-
-CORS_ALLOWED_ORIGINS = getenv("CORS_ALLOWED_ORIGINS", "").split(",")
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -39,12 +33,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "app.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "app.middleware.BodySizeMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "app.middleware.PrimaryPinMiddleware",
 ]
 
 ROOT_URLCONF = "settings.urls"
@@ -70,20 +67,127 @@ WSGI_APPLICATION = "settings.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": getenv("DATABASE_NAME"),
-        "USER": getenv("DATABASE_USER"),
-        "PASSWORD": getenv("DATABASE_PASSWORD"),
-        "HOST": getenv("DATABASE_HOST"),
-        "PORT": getenv("DATABASE_PORT"),
+        "NAME": CONFIG.database_name,
+        "USER": CONFIG.database_user,
+        "PASSWORD": CONFIG.database_password,
+        "HOST": CONFIG.database_host,
+        "PORT": CONFIG.database_port,
+        "CONN_MAX_AGE": CONFIG.database_conn_max_age,
+        "CONN_HEALTH_CHECKS": CONFIG.database_conn_health_checks,
     }
 }
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+REPLICA_DATABASES = []
+
+for index, host in enumerate(CONFIG.database_replica_hosts):
+    alias = f"replica_{index + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["app.routers.ReplicaRouter"]
+
+REPLICA_PIN_COOKIE = "primary_pin"
+
+REPLICA_PIN_SECONDS = CONFIG.replica_pin_seconds
+
+VOTES_BUFFERED = CONFIG.votes_buffered
+
+VOTES_BUFFER_SIZE = CONFIG.votes_buffer_size
+
+VOTES_BUFFER_SECONDS = CONFIG.votes_buffer_seconds
+
+FEED_FANOUT_LIMIT = CONFIG.feed_fanout_limit
+
+PROJECTS_BATCH_LIMIT = CONFIG.projects_batch_limit
+
+IDEMPOTENCY_KEY_SECONDS = CONFIG.idempotency_key_seconds
+
+ESTIMATED_COUNT_THRESHOLD = CONFIG.estimated_count_threshold
+
+PARTITIONS_AHEAD_MONTHS = CONFIG.partitions_ahead_months
+
+ACTIVITY_BUFFER_SIZE = CONFIG.activity_buffer_size
+
+ACTIVITY_BUFFER_SECONDS = CONFIG.activity_buffer_seconds
+
+ANALYTICS_MAX_DAYS = CONFIG.analytics_max_days
+
+COMMENT_MAX_LENGTH = CONFIG.comment_max_length
+
+COMMENT_MAX_ATTACHMENTS = CONFIG.comment_max_attachments
+
+COMMENT_MAX_BODY_SIZE = CONFIG.comment_max_body_size
+
+COMMENT_MAX_DEPTH = CONFIG.comment_max_depth
+
+EVENTS_BACKEND = CONFIG.events_backend
+
+EVENTS_QUEUE_SIZE = CONFIG.events_queue_size
+
+EVENTS_HEARTBEAT_SECONDS = CONFIG.events_heartbeat_seconds
+
+if CONFIG.redis_url:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CONFIG.redis_url,
+            "TIMEOUT": CONFIG.cache_timeout,
+            "OPTIONS": (
+                {"max_connections": CONFIG.redis_max_connections}
+                if CONFIG.redis_max_connections
+                else {}
+            ),
+        }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "TIMEOUT": CONFIG.cache_timeout,
+        }
+    }
+
+THROTTLE_CACHE = "default"
+
+COMPRESSION_MIN_SIZE = CONFIG.compression_min_size
+
+COMPRESSION_CONTENT_TYPES = (
+    "application/json",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        CONFIG.json_renderer,
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": ["app.throttling.TokenBucketThrottle"],
+    "DEFAULT_THROTTLE_RATES": {
+        "default": CONFIG.throttle_rate_default,
+        "write": CONFIG.throttle_rate_write,
+        "vote": CONFIG.throttle_rate_vote,
+        "bulk": CONFIG.throttle_rate_bulk,
+    },
+    "NUM_PROXIES": CONFIG.num_proxies,
 }
 
+LOOKUP_TABLES_CHECK_INTERVAL = CONFIG.lookup_tables_check_interval
+
+PAGE_SIZE = CONFIG.page_size
+
+MAX_PAGE_SIZE = CONFIG.max_page_size
+
+INDEX_CARDS = CONFIG.index_cards
+
+INDEX_CACHE_SECONDS = CONFIG.index_cache_seconds
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -111,11 +215,28 @@ STATIC_URL = "static/"
 
 if DEBUG:
     STATICFILES_DIRS = [Path(BASE_DIR / "static")]
+    STATICFILES_BACKEND = "django.contrib.staticfiles.storage.StaticFilesStorage"
 else:
     STATIC_ROOT = Path(BASE_DIR / "static")
+    STATICFILES_BACKEND = "app.storage.CompressedManifestStaticFilesStorage"
 
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": STATICFILES_BACKEND,
+    },
+}
+
+STATIC_MAX_AGE = CONFIG.static_max_age
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = Path(BASE_DIR / "static/media")
 
+MEDIA_SENDFILE_HEADER = CONFIG.media_sendfile_header
+
+MEDIA_SENDFILE_PREFIX = CONFIG.media_sendfile_prefix
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"